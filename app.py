@@ -1,11 +1,221 @@
+from datetime import date, datetime, timezone
+import csv
+import json
 import logging
+import os
+import time
+from typing import Any, Callable
 
-from flask import Flask, render_template, abort, redirect
+import click
+from flask import (
+    Flask, Response, abort, g, make_response, redirect, render_template, request
+)
 
+from export import directory_digest, export_site
+from game_schedule import RefreshScheduler
+import metrics
+from models import Season
+from projection import Projector
+from refresher import StandingsRefresher
+from rosters import compile_rosters, index_path, write_roster_index
 from seasons import CURRENT_SEASON, ALL_SEASONS
+from snapshots import SeasonSnapshot, freeze, get_snapshot, is_frozen
+from stats_store import get_stats_store
+from utils.ttl_cache import TTLCache
+from what_if import CSV_HEADER, RULE_NAMES, RuleVariants, load_cached_season, simulate
 
 app = Flask(__name__)
 
+# Report the time spent rendering and rating in a Server-Timing header on every response.
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "").lower() in ("1", "true", "yes")
+
+# Whether refreshes only fetch the stats of players whose clubs played since the last one.
+GAME_AWARE_REFRESH = os.environ.get("GAME_AWARE_REFRESH", "1").lower() in ("1", "true", "yes")
+
+# Whether the standings page shows each manager's odds of finishing first, from
+# Monte Carlo projections computed in the background.
+PROJECTIONS = os.environ.get("PROJECTIONS", "1").lower() in ("1", "true", "yes")
+projector = Projector(
+    num_simulations=int(os.environ.get("PROJECTION_SIMULATIONS", 20000)),
+    max_workers=int(os.environ.get("PROJECTION_WORKERS", 2)),
+)
+
+# The current season is recomputed in the background; pages only read the latest result.
+refresher = StandingsRefresher(
+    CURRENT_SEASON,
+    interval=float(os.environ.get("STANDINGS_REFRESH_INTERVAL", 300)),
+    scheduler=(
+        RefreshScheduler(
+            CURRENT_SEASON,
+            max_interval=float(os.environ.get("STATS_MAX_REFRESH_INTERVAL", 21600)),
+        )
+        if GAME_AWARE_REFRESH and not CURRENT_SEASON.completed
+        else None
+    ),
+    projector=projector if PROJECTIONS and not CURRENT_SEASON.completed else None,
+)
+
+
+# Standings as of past dates, computed from ingested game logs, by (year, date).
+AS_OF_SNAPSHOTS = TTLCache(ttl=600, maxsize=32)
+
+
+def parse_as_of() -> date | None:
+    value = request.args.get("as_of")
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, description="as_of must be a date formatted as YYYY-MM-DD.")
+
+
+def load_snapshot(season: Season) -> SeasonSnapshot:
+    as_of = parse_as_of()
+    if as_of is not None:
+        # Opening a season's store would create it, e.g. for a season never refreshed.
+        store = get_stats_store(season.year)
+        if not os.path.exists(store.path) or not store.has_game_logs():
+            abort(404, description=f"No game logs have been ingested for {season.year}.")
+        try:
+            return AS_OF_SNAPSHOTS.get(
+                (season.year, as_of), lambda: SeasonSnapshot.as_of(season, as_of)
+            )
+        except LookupError as e:
+            abort(404, description=str(e))
+    if season is not CURRENT_SEASON:
+        return get_snapshot(season)
+    snapshot = refresher.get_latest()
+    if snapshot is None:
+        abort(
+            503,
+            description="Standings are being computed. Please try again shortly.",
+            retry_after=10,
+        )
+    return snapshot
+
+
+def last_refreshed(season: Season) -> float | None:
+    """When the season's standings were last refreshed, even if they did not change."""
+    if season is not CURRENT_SEASON or parse_as_of() is not None:
+        return None
+    return refresher.refreshed_at
+
+
+# Digest of the templates, so that pages rendered by a previous deploy are neither
+# served from PAGE_CACHE after a reload nor revalidated by clients with their ETags.
+TEMPLATES_DIGEST = directory_digest(os.path.join(app.root_path, app.template_folder))[:8]
+
+# Rendered pages and API payloads, keyed by (templates, kind, year, manager, snapshot
+# version, as_of, variant), where the variant tells apart pages of the same snapshot
+# with different extras, such as the minute of the last refresh they show. Responses
+# for superseded snapshots are never requested again and age out by LRU.
+PAGE_CACHE = TTLCache(ttl=0, maxsize=int(os.environ.get("PAGE_CACHE_SIZE", 256)))
+
+# How long clients and proxies may reuse a page before revalidating it. Completed
+# seasons that could not be frozen yet may still change, like the current one.
+CURRENT_SEASON_MAX_AGE = 60
+COMPLETED_SEASON_MAX_AGE = 86400
+
+
+def cached_response(
+    season: Season,
+    snapshot: SeasonSnapshot,
+    kind: str,
+    render: Callable[[], str],
+    manager: str = "",
+    mimetype: str = "text/html",
+    variant: str = "",
+    refreshed_at: float | None = None,
+) -> Response:
+    """Render a response for a snapshot at most once, and answer conditional GETs with 304s.
+
+    A response showing when the standings were last refreshed is rendered again
+    once a refresh changes the time shown, even if the snapshot did not change.
+    """
+    as_of = parse_as_of()
+    modified_at = snapshot.created_at
+    if refreshed_at is not None:
+        variant = "-".join(part for part in (variant, f"r{int(refreshed_at // 60)}") if part)
+        modified_at = max(modified_at, refreshed_at)
+    key = (TEMPLATES_DIGEST, kind, season.year, manager.lower(), snapshot.version, as_of, variant)
+    metrics.count_cache_lookup("pages", key in PAGE_CACHE)
+    body = PAGE_CACHE.get(key, render)
+
+    response = make_response(body)
+    response.mimetype = mimetype
+    response.set_etag("-".join(
+        str(part) for part in (TEMPLATES_DIGEST, snapshot.version, as_of, variant) if part
+    ))
+    response.last_modified = datetime.fromtimestamp(modified_at, tz=timezone.utc)
+    response.cache_control.public = True
+    if season.completed and is_frozen(season):
+        response.cache_control.max_age = COMPLETED_SEASON_MAX_AGE
+    else:
+        response.cache_control.max_age = CURRENT_SEASON_MAX_AGE
+    return response.make_conditional(request)
+
+
+def cached_page(
+    season: Season,
+    snapshot: SeasonSnapshot,
+    template: str,
+    context: dict[str, Any],
+    manager: str = "",
+    variant: str = "",
+) -> Response:
+    def render() -> str:
+        with metrics.TEMPLATE_RENDER_SECONDS.time(template=template):
+            return render_template(template, **context)
+
+    return cached_response(
+        season,
+        snapshot,
+        template,
+        render,
+        manager,
+        variant=variant,
+        refreshed_at=context.get("refreshed_at"),
+    )
+
+
+def cached_json(
+    season: Season, snapshot: SeasonSnapshot, payload: Callable[[], Any], manager: str = ""
+) -> Response:
+    return cached_response(
+        season,
+        snapshot,
+        "json",
+        lambda: json.dumps(payload(), separators=(",", ":")),
+        manager,
+        mimetype="application/json",
+    )
+
+
+def load_season(year: int, manager: str | None = None) -> Season:
+    season = ALL_SEASONS.get(year)
+    if season is None or (manager is not None and not season.has_manager(manager)):
+        abort(404)
+    return season
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if SERVER_TIMING:
+        metrics.start_server_timing()
+
+
+@app.after_request
+def record_request_time(response: Response) -> Response:
+    duration = time.perf_counter() - g.request_started
+    metrics.REQUEST_SECONDS.observe(duration, endpoint=request.endpoint or "unknown")
+    if SERVER_TIMING:
+        timings = metrics.finish_server_timing()
+        total = f"total;dur={duration * 1000:.1f}"
+        response.headers["Server-Timing"] = f"{timings}, {total}" if timings else total
+    return response
+
 
 @app.context_processor
 def inject_season_list():
@@ -19,22 +229,171 @@ def home():
 
 @app.route("/<int:year>")
 def standings(year: int):
-    season = ALL_SEASONS.get(year)
-    if season is None:
-        abort(404)
-    return render_template("home.html", season=season)
+    season = load_season(year)
+    snapshot = load_snapshot(season)
+    win_probabilities = None
+    if season is CURRENT_SEASON and parse_as_of() is None:
+        win_probabilities = projector.get(snapshot.version)
+    context = dict(
+        season=snapshot,
+        refreshed_at=last_refreshed(season),
+        as_of=parse_as_of(),
+        win_probabilities=win_probabilities,
+    )
+    variant = "projected" if win_probabilities else ""
+    return cached_page(season, snapshot, "home.html", context, variant=variant)
 
 
 @app.route("/<int:year>/<manager>")
 def team_stats(year: int, manager: str):
-    season = ALL_SEASONS.get(year)
-    if season is None:
+    season = load_season(year, manager)
+    snapshot = load_snapshot(season)
+    team = snapshot.team(manager)
+    if team is None:
         abort(404)
-    team = season.teams.get(manager.lower())
+    context = dict(
+        team=team, refreshed_at=last_refreshed(season), as_of=parse_as_of()
+    )
+    return cached_page(season, snapshot, "team.html", context, manager=manager)
+
+
+@app.route("/api/<int:year>/standings")
+def standings_api(year: int):
+    season = load_season(year)
+    snapshot = load_snapshot(season)
+    return cached_json(season, snapshot, snapshot.standings_dict)
+
+
+@app.route("/api/<int:year>/<manager>")
+def team_stats_api(year: int, manager: str):
+    season = load_season(year, manager)
+    snapshot = load_snapshot(season)
+    team = snapshot.team(manager)
     if team is None:
         abort(404)
-    team.fetch_all_stats()
-    return render_template("team.html", team=team)
+    return cached_json(season, snapshot, team.to_dict, manager=manager)
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.cli.command("freeze")
+@click.argument("years", nargs=-1, type=int)
+def freeze_command(years: tuple[int, ...]):
+    """Write standings snapshots for completed seasons (default: all of them)."""
+    for year in years or sorted(ALL_SEASONS):
+        season = ALL_SEASONS.get(year)
+        if season is None:
+            raise click.BadParameter(f"Unknown season: {year}")
+        if not season.completed and years:
+            raise click.BadParameter(f"The {year} season is not completed")
+        if season.completed:
+            try:
+                freeze(season)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            click.echo(f"Froze {year} season to {season.snapshot_path}")
+
+
+@app.cli.command("compile-rosters")
+@click.argument("years", nargs=-1, type=int)
+def compile_rosters_command(years: tuple[int, ...]):
+    """Validate the YAML rosters and write each season's roster index (default: all)."""
+    all_errors = []
+    for year in years or sorted(ALL_SEASONS):
+        season = ALL_SEASONS.get(year)
+        if season is None:
+            raise click.BadParameter(f"Unknown season: {year}")
+        index, errors = compile_rosters(season)
+        if errors:
+            all_errors.extend(errors)
+            continue
+        write_roster_index(season, index)
+        click.echo(f"Compiled {len(index['teams'])} rosters to {index_path(season)}")
+    if all_errors:
+        for error in all_errors:
+            click.echo(error, err=True)
+        raise click.ClickException(f"Found {len(all_errors)} roster errors")
+
+
+@app.cli.command("export")
+@click.argument("years", nargs=-1, type=int)
+@click.option("--output", default="build", show_default=True, help="Output directory.")
+@click.option("--workers", default=8, show_default=True, help="Number of parallel renders.")
+def export_command(years: tuple[int, ...], output: str, workers: int):
+    """Render every season's pages and API payloads to static files (default: all seasons)."""
+    seasons = []
+    for year in years or sorted(ALL_SEASONS):
+        season = ALL_SEASONS.get(year)
+        if season is None:
+            raise click.BadParameter(f"Unknown season: {year}")
+        seasons.append(season)
+    written, unchanged = export_site(app, seasons, output, max_workers=workers)
+    click.echo(f"Wrote {written} files to {output} ({unchanged} unchanged)")
+
+
+def parse_rule_choices(values: tuple[str, ...]) -> dict[str, list[float]]:
+    choices = {}
+    for value in values:
+        name, _, numbers = value.partition("=")
+        if name not in RULE_NAMES:
+            raise click.BadParameter(f"Unknown rule: {name}", param_hint="--rule")
+        try:
+            choices[name] = [float(number) for number in numbers.split(",")]
+        except ValueError:
+            raise click.BadParameter(f"Invalid values for {name}: {numbers}", param_hint="--rule")
+    return choices
+
+
+@app.cli.command("what-if")
+@click.argument("years", nargs=-1, type=int)
+@click.option(
+    "--rule", "rules", multiple=True, metavar="NAME=V1,V2,...",
+    help="Values of a rule to try. Every combination of the given values is evaluated.",
+)
+@click.option("--csv", "csv_path", help="Also write every team's rating under every variant.")
+def what_if_command(years: tuple[int, ...], rules: tuple[str, ...], csv_path: str | None):
+    """Rate each season's teams under variants of its rules, from cached stats (default: all)."""
+    choices = parse_rule_choices(rules)
+    results = []
+    for year in years or sorted(ALL_SEASONS):
+        season = ALL_SEASONS.get(year)
+        if season is None:
+            raise click.BadParameter(f"Unknown season: {year}")
+        season, avg_games_played, missing = load_cached_season(season)
+        if missing:
+            # Players without stats would be rated as if they had none.
+            click.echo(f"{year}: {missing} players have no cached stats, skipping", err=True)
+            continue
+        if avg_games_played is None:
+            click.echo(f"{year}: no cached standings, skipping", err=True)
+            continue
+        result = simulate(season, RuleVariants.grid(season.rules, choices), avg_games_played)
+        results.append(result)
+
+        baseline_winner = result.managers[result.baseline.argmax()]
+        click.echo(f"{year}: {result.variants.num_variants} variants, winner {baseline_winner}")
+        for row in result.summary():
+            rules_text = ", ".join(f"{name}={value:g}" for name, value in row["rules"].items())
+            click.echo(
+                f"  {rules_text or 'baseline'}: winner {row['winner']},"
+                f" {row['teams_moved']} teams moved,"
+                f" max rating change {row['max_rating_change']:.1f}"
+            )
+
+    if not results:
+        raise click.ClickException(
+            "No season has cached stats for every player. Fetch them by serving the season first."
+        )
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for result in results:
+                result.write_csv(writer)
+        click.echo(f"Wrote {len(results)} seasons to {csv_path}")
 
 
 @app.template_filter('pluralize')
@@ -43,6 +402,11 @@ def pluralize(number: int, singular='', plural='s') -> str:
     return singular if number == 1 else plural
 
 
+@app.template_filter('timestamp')
+def format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%b %-d, %H:%M UTC")
+
+
 if __name__ == "__main__":
     logging.basicConfig(format="%(levelname)-7s %(message)s", level=logging.INFO)
     app.run()
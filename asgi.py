@@ -0,0 +1,50 @@
+"""ASGI entry point, for serving the app with uvicorn workers::
+
+    ASYNC_STATS=1 gunicorn -k uvicorn.workers.UvicornWorker asgi:application
+
+Each worker accepts connections on its event loop, but the Flask views are still
+synchronous: each request runs on one of the worker's WSGI_THREADS view threads,
+and a view waiting on the MLB Stats API, or computing standings, blocks its thread
+as under sync workers. (asgiref's WsgiToAsgi would run every view of the worker on
+a single thread.) What ASYNC_STATS changes is the upstream calls, which are all
+made from the worker's stats loop (see stats_client.py) over one keep-alive
+connection pool, so refreshes keep many calls in flight without a thread each.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+from app import app
+
+# Threads that each worker runs its views on.
+VIEW_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("WSGI_THREADS", 16)), thread_name_prefix="view"
+)
+
+# WsgiToAsgiInstance.run_wsgi_app without its thread-sensitive sync_to_async wrapper.
+# This is private to asgiref, which is pinned to an exact version in requirements.txt;
+# fail on startup, rather than serve every view on one thread, if another lacks it.
+_run_wsgi_app = getattr(WsgiToAsgiInstance.run_wsgi_app, "__wrapped__", None)
+if not callable(_run_wsgi_app):
+    raise ImportError(
+        "asgiref's WsgiToAsgiInstance.run_wsgi_app is no longer a sync_to_async wrapper;"
+        " update asgi.py for this version of asgiref"
+    )
+
+
+class ThreadPoolWsgiToAsgiInstance(WsgiToAsgiInstance):
+    async def run_wsgi_app(self, body):
+        run = sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=VIEW_EXECUTOR)
+        await run(self, body)
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """Like WsgiToAsgi, but runs concurrent requests on the threads of VIEW_EXECUTOR."""
+
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiToAsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+application = ThreadPoolWsgiToAsgi(app)
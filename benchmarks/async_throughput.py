@@ -0,0 +1,143 @@
+"""Throughput of the threaded and asyncio stats fetching models, over HTTP.
+
+Run from the repository root::
+
+    python -m benchmarks.async_throughput [--season 2026] [--latency 0.05] [--concurrency 8]
+
+Each model refreshes every player of the season, bypassing caches, from
+``--concurrency`` concurrent callers, against :class:`OfflineStatsServer` on
+localhost. The threaded model fetches through ``models.statsapi_get``, which
+makes a ``requests`` call with a timeout and a new connection each time, on the
+shared fetch pool. The asyncio model fetches through one :class:`AsyncStatsClient`
+on the stats loop, over keep-alive connections, as with ``ASYNC_STATS=1``.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import dataclasses
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Iterator
+
+from benchmarks.offline_statsapi import (
+    FIXTURE_PATH,
+    OfflineStatsAPI,
+    OfflineStatsServer,
+    load_fixture,
+)
+
+
+@contextlib.contextmanager
+def statsapi_base_url(base_url: str) -> Iterator[None]:
+    """Point the statsapi module's endpoint URLs at another base URL."""
+    from statsapi.endpoints import ENDPOINTS
+
+    originals = {name: endpoint["url"] for name, endpoint in ENDPOINTS.items()}
+    for endpoint in ENDPOINTS.values():
+        endpoint["url"] = endpoint["url"].replace("https://statsapi.mlb.com/api/", base_url)
+    try:
+        yield
+    finally:
+        for name, url in originals.items():
+            ENDPOINTS[name]["url"] = url
+
+
+def run_benchmarks(
+    year: int, api: OfflineStatsAPI, base_url: str, concurrency: int, repeat: int
+) -> dict[str, tuple[float, float]]:
+    """Median seconds and API calls per second of each model."""
+    import asyncio
+
+    import models
+    from seasons import ALL_SEASONS
+    import stats_store
+    from stats_client import AsyncStatsClient, StatsLoop
+
+    base_season = ALL_SEASONS[year]
+    stats_dir = tempfile.TemporaryDirectory(prefix="benchmark-stats-")
+
+    def callers() -> list[list[models.Player]]:
+        """Each caller's copy of the season's players, from an empty stats store."""
+        stats_store.STATS_STORE_DIR = tempfile.mkdtemp(dir=stats_dir.name)
+        models.PLAYER_STATS_CACHE.invalidate()
+        return [
+            [
+                player
+                for team in dataclasses.replace(base_season).teams.values()
+                for player in team.players
+            ]
+            for _ in range(concurrency)
+        ]
+
+    def threaded(players: list[list[models.Player]]):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(
+                lambda p: models.fetch_stats(p, {player.cache_key for player in p}), players
+            ))
+
+    loop = StatsLoop(AsyncStatsClient(base_url=base_url))
+
+    def asynchronous(players: list[list[models.Player]]):
+        async def fetch_all(client: AsyncStatsClient):
+            await asyncio.gather(*(
+                models.fetch_stats_async(p, client, {player.cache_key for player in p})
+                for p in players
+            ))
+
+        loop.run(fetch_all)
+
+    def measure(fn: Callable[[list[list[models.Player]]], None]) -> tuple[float, float]:
+        durations, rates = [], []
+        for _ in range(repeat):
+            players = callers()
+            calls = api.calls
+            start = time.perf_counter()
+            fn(players)
+            durations.append(time.perf_counter() - start)
+            rates.append((api.calls - calls) / durations[-1])
+        return statistics.median(durations), statistics.median(rates)
+
+    results = {}
+    with stats_dir:
+        with statsapi_base_url(base_url):
+            results["threaded"] = measure(threaded)
+        results["asyncio"] = measure(asynchronous)
+        loop.close()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    from seasons import CURRENT_SEASON
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--season", type=int, default=CURRENT_SEASON.year)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per API call")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent refreshes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    args = parser.parse_args(argv)
+
+    fixture = load_fixture(args.fixture)
+    if fixture is None:
+        print(f"No fixture at {args.fixture}, using synthetic stats")
+    server = OfflineStatsServer(OfflineStatsAPI(fixture, latency=args.latency))
+    server.start()
+    try:
+        results = run_benchmarks(
+            args.season, server.api, server.base_url, args.concurrency, args.repeat
+        )
+    finally:
+        server.stop()
+
+    print(f"{'model':<10} {'median':>9} {'calls/s':>9}")
+    for name, (seconds, rate) in results.items():
+        print(f"{name:<10} {seconds:>8.3f}s {rate:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Local stand-in for the MLB Stats API, for benchmarks that must not use the network.
+
+Responses come from a fixture recorded with ``python -m benchmarks.record``. When
+no fixture has been recorded, deterministic synthetic stats, game logs and
+schedules are generated instead, so benchmarks can always run offline.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import statsapi
+
+from constants import TEAM_ABBREVIATIONS
+
+FIXTURE_PATH = "benchmarks/fixtures/statsapi.json"
+
+HYDRATE_STATS = re.compile(
+    r"stats\(group=\[(\w+)\],type=\[(season|gameLog)\],season=(\d+)(?:,startDate=([\d-]+))?\)"
+)
+
+# Names of the MLB clubs, which synthetic players are spread over.
+TEAM_NAMES = sorted(TEAM_ABBREVIATIONS)
+
+
+def person_key(mlb_id: int, stats_group: str, stats_year: int, stats_type: str = "season") -> str:
+    if stats_type != "season":
+        return f"{mlb_id}:{stats_group}:{stats_year}:{stats_type}"
+    return f"{mlb_id}:{stats_group}:{stats_year}"
+
+
+def standings_key(league_id: Any, season: Any) -> str:
+    return f"{league_id}:{season}"
+
+
+def load_fixture(path: str = FIXTURE_PATH) -> dict[str, dict] | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def synthetic_stats(mlb_id: int, stats_group: str, stats_year: int) -> dict[str, int]:
+    rng = random.Random(mlb_id * 31 + stats_year)
+    if stats_group == "hitting":
+        at_bats = rng.randint(50, 600)
+        return {
+            "gamesPlayed": rng.randint(10, 160),
+            "atBats": at_bats,
+            "runs": rng.randint(0, 100),
+            "hits": int(at_bats * rng.uniform(0.18, 0.32)),
+            "homeRuns": rng.randint(0, 40),
+            "rbi": rng.randint(0, 110),
+            "stolenBases": rng.randint(0, 30),
+        }
+    return {
+        "gamesPlayed": rng.randint(5, 33),
+        "outs": rng.randint(30, 600),
+        "earnedRuns": rng.randint(5, 90),
+        "wins": rng.randint(0, 15),
+        "saves": rng.randint(0, 30),
+        "strikeOuts": rng.randint(10, 220),
+        "baseOnBalls": rng.randint(5, 70),
+    }
+
+
+def synthetic_game_log(mlb_id: int, stats_group: str, stats_year: int) -> list[dict[str, Any]]:
+    """One split per game, a day apart from opening day, adding up to the synthetic stats."""
+    stats = synthetic_stats(mlb_id, stats_group, stats_year)
+    num_games = stats.pop("gamesPlayed")
+    opening_day = date(stats_year, 3, 28)
+    return [
+        {
+            "date": (opening_day + timedelta(days=i)).isoformat(),
+            "game": {"gamePk": stats_year * 1000 + i},
+            "stat": {
+                "gamesPlayed": 1,
+                **{
+                    name: total // num_games + (i < total % num_games)
+                    for name, total in stats.items()
+                },
+            },
+        }
+        for i in range(num_games)
+    ]
+
+
+def synthetic_person(
+    mlb_id: int, stats_group: str, stats_year: int, stats_type: str = "season"
+) -> dict[str, Any]:
+    if stats_type == "gameLog":
+        splits = synthetic_game_log(mlb_id, stats_group, stats_year)
+    else:
+        splits = [{
+            "season": str(stats_year),
+            "stat": synthetic_stats(mlb_id, stats_group, stats_year),
+        }]
+    return {
+        "id": mlb_id,
+        "currentTeam": {"id": 100 + mlb_id % len(TEAM_NAMES), "name": synthetic_team(mlb_id)},
+        "stats": [{
+            "group": {"displayName": stats_group},
+            "type": {"displayName": stats_type},
+            "splits": splits,
+        }],
+    }
+
+
+def synthetic_team(mlb_id: int) -> str:
+    return TEAM_NAMES[mlb_id % len(TEAM_NAMES)]
+
+
+def synthetic_standings(season: Any) -> dict[str, Any]:
+    games = 162 if int(season) < time.gmtime().tm_year else 81
+    return {"200": {"teams": [{"w": games // 2, "l": games - games // 2}] * 15}}
+
+
+# Statuses of the synthetic games scheduled for today, by club pairing.
+SYNTHETIC_STATUSES = ("Final", "In Progress", "Scheduled")
+
+
+def synthetic_schedule(start: date, end: date) -> list[dict[str, Any]]:
+    """Every club plays daily: games before today are final, and today's are in any state."""
+    games = []
+    day = start
+    while day <= end:
+        for i in range(0, len(TEAM_NAMES) - 1, 2):
+            status = "Final" if day < date.today() else SYNTHETIC_STATUSES[i // 2 % 3]
+            games.append({
+                "game_id": int(day.strftime("%Y%m%d")) * 100 + i // 2,
+                "game_date": day.isoformat(),
+                "away_name": TEAM_NAMES[i],
+                "home_name": TEAM_NAMES[i + 1],
+                "status": status,
+            })
+        day += timedelta(days=1)
+    return games
+
+
+def parse_schedule_date(value: str) -> date:
+    return datetime.strptime(value, "%m/%d/%Y").date()
+
+
+class OfflineStatsAPI:
+    """Serves the statsapi calls made by the app, with an injected latency per call."""
+
+    def __init__(self, fixture: dict[str, dict] | None = None, latency: float = 0.0):
+        self.fixture = fixture
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._originals: dict[tuple[Any, str], Any] = {}
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get(self, endpoint: str, params: dict[str, Any], force: bool = False) -> dict[str, Any]:
+        if endpoint == "standings":
+            return self.standings(**params)
+        if endpoint == "schedule":
+            return self.schedule_data(**params)
+        self._call()
+        if endpoint != "people":
+            raise ValueError(f"Endpoint not available offline: {endpoint}")
+        stats_group, stats_type, stats_year, start_date = HYDRATE_STATS.search(
+            params["hydrate"]
+        ).groups()
+        people = []
+        for mlb_id in params["personIds"].split(","):
+            mlb_id = int(mlb_id)
+            if self.fixture is None:
+                person = synthetic_person(mlb_id, stats_group, int(stats_year), stats_type)
+            else:
+                person = self.fixture["people"].get(
+                    person_key(mlb_id, stats_group, int(stats_year), stats_type)
+                )
+            if person is None:
+                continue
+            if start_date is not None:
+                person = {**person, "stats": [
+                    {**group, "splits": [s for s in group["splits"] if s["date"] >= start_date]}
+                    for group in person["stats"]
+                ]}
+            people.append(person)
+        return {"people": people}
+
+    def standings_data(self, leagueId: Any = "103,104", season: Any = None, **kwargs):
+        self._call()
+        if self.fixture is None:
+            return synthetic_standings(season)
+        return self.fixture["standings"][standings_key(leagueId, season)]
+
+    def schedule(self, start_date: str | None = None, end_date: str | None = None, **kwargs):
+        """Games between two dates, or the recorded schedule if the fixture has one."""
+        self._call()
+        start = parse_schedule_date(start_date) if start_date else date.today()
+        end = parse_schedule_date(end_date) if end_date else start
+        if self.fixture is None or "schedule" not in self.fixture:
+            return synthetic_schedule(start, end)
+        return self.fixture["schedule"]
+
+    def schedule_data(
+        self, startDate: str | None = None, endDate: str | None = None, **kwargs
+    ) -> dict[str, Any]:
+        """The raw schedule endpoint's response, with the games of schedule."""
+        games = self.schedule(
+            start_date=date.fromisoformat(startDate).strftime("%m/%d/%Y") if startDate else None,
+            end_date=date.fromisoformat(endDate).strftime("%m/%d/%Y") if endDate else None,
+        )
+        return {
+            "dates": [
+                {
+                    "games": [
+                        {
+                            "gamePk": game["game_id"],
+                            "teams": {
+                                "away": {"team": {"name": game["away_name"]}},
+                                "home": {"team": {"name": game["home_name"]}},
+                            },
+                            "status": {"detailedState": game["status"]},
+                        }
+                        for game in games
+                    ]
+                }
+            ]
+        }
+
+    def standings(self, leagueId: Any = "103,104", season: Any = None, **kwargs):
+        """The raw standings endpoint's response, with the records of standings_data."""
+        divisions = self.standings_data(leagueId, season)
+        return {
+            "records": [
+                {
+                    "teamRecords": [
+                        {
+                            "team": {
+                                "id": i,
+                                "name": team.get("name", f"Team {i}"),
+                                "division": {"id": int(division_id), "name": str(division_id)},
+                            },
+                            "wins": team["w"],
+                            "losses": team["l"],
+                        }
+                        for i, team in enumerate(division["teams"])
+                    ]
+                }
+                for division_id, division in divisions.items()
+            ]
+        }
+
+    def install(self):
+        """Replace the network calls of the statsapi module and the app with this stand-in."""
+        import models
+
+        targets = {
+            (statsapi, "get"): self.get,
+            (statsapi, "schedule"): self.schedule,
+            (statsapi, "standings_data"): self.standings_data,
+            (models, "statsapi_get"): self.get,
+        }
+        for (module, name), replacement in targets.items():
+            self._originals.setdefault((module, name), getattr(module, name))
+            setattr(module, name, replacement)
+
+    def uninstall(self):
+        for (module, name), original in self._originals.items():
+            setattr(module, name, original)
+        self._originals.clear()
+
+
+class OfflineStatsServer:
+    """Serves an OfflineStatsAPI over HTTP on localhost, with keep-alive connections.
+
+    Used to compare HTTP clients, which the in-process stand-in bypasses. The
+    people, standings and schedule endpoints are served under :attr:`base_url`,
+    in place of https://statsapi.mlb.com/api/.
+    """
+
+    def __init__(self, api: OfflineStatsAPI):
+        self.api = api
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = dict(parse_qsl(url.query))
+                if url.path == "/api/v1/people":
+                    payload = server.api.get("people", params)
+                elif url.path == "/api/v1/standings":
+                    payload = server.api.standings(**params)
+                elif url.path == "/api/v1/schedule":
+                    payload = server.api.schedule_data(**params)
+                else:
+                    self.send_error(404)
+                    return
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
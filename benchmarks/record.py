@@ -0,0 +1,78 @@
+"""Record the MLB Stats API responses for every season's rosters into the benchmark fixture.
+
+Besides season stats and standings, the game logs of the current season's
+players and the schedule of the day before and today are recorded.
+
+Run from the repository root, with network access::
+
+    python -m benchmarks.record
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+import json
+import os
+
+import statsapi
+
+from benchmarks.offline_statsapi import FIXTURE_PATH, person_key, standings_key
+from models import BULK_STATS_BATCH_SIZE
+from seasons import ALL_SEASONS, CURRENT_SEASON
+
+
+def record(path: str = FIXTURE_PATH):
+    groups: dict[tuple[str, int], set[int]] = defaultdict(set)
+    standings = {}
+    for season in ALL_SEASONS.values():
+        for team in season.teams.values():
+            for player in team.players:
+                groups[(player.stats_group, player.stats_year)].add(player.mlb_id)
+        standings[standings_key(season.league_id, season.year)] = statsapi.standings_data(
+            season.league_id, season=season.year
+        )
+
+    fetches = [
+        (stats_group, stats_year, "season", mlb_ids)
+        for (stats_group, stats_year), mlb_ids in sorted(groups.items())
+    ]
+    fetches += [
+        (stats_group, stats_year, "gameLog", mlb_ids)
+        for (stats_group, stats_year), mlb_ids in sorted(groups.items())
+        if stats_year == CURRENT_SEASON.year and not CURRENT_SEASON.completed
+    ]
+
+    people = {}
+    for stats_group, stats_year, stats_type, mlb_ids in fetches:
+        mlb_ids = sorted(mlb_ids)
+        stats = f"group=[{stats_group}],type=[{stats_type}],season={stats_year}"
+        for i in range(0, len(mlb_ids), BULK_STATS_BATCH_SIZE):
+            batch = mlb_ids[i:i + BULK_STATS_BATCH_SIZE]
+            data = statsapi.get("people", {
+                "personIds": ",".join(str(i) for i in batch),
+                "hydrate": f"currentTeam,stats({stats})",
+            })
+            for person in data.get("people", []):
+                people[person_key(person["id"], stats_group, stats_year, stats_type)] = person
+
+    today = date.today()
+    schedule = statsapi.schedule(
+        start_date=(today - timedelta(days=1)).strftime("%m/%d/%Y"),
+        end_date=today.strftime("%m/%d/%Y"),
+    )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"people": people, "standings": standings, "schedule": schedule},
+            f,
+            separators=(",", ":"),
+        )
+    print(
+        f"Recorded {len(people)} players, {len(standings)} standings"
+        f" and {len(schedule)} games to {path}"
+    )
+
+
+if __name__ == "__main__":
+    record()
@@ -0,0 +1,164 @@
+"""Offline performance benchmarks, which fail when a measurement exceeds its threshold.
+
+Run from the repository root::
+
+    python -m benchmarks.run [--season 2026] [--latency 0.05] [--threshold standings_cold=2]
+
+The MLB Stats API is replaced by :class:`OfflineStatsAPI`, which answers from the
+recorded fixture (or with synthetic stats) after the given latency per call.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.offline_statsapi import FIXTURE_PATH, OfflineStatsAPI, load_fixture
+
+# Maximum median duration of each benchmark, in seconds, at the default latency.
+DEFAULT_THRESHOLDS: dict[str, float] = {
+    "app_startup": 1.5,
+    "standings_cold": 3.0,
+    "standings_warm": 0.25,
+    "team_fetch_cold": 1.0,
+    "team_fetch_warm": 0.05,
+    "team_page_render": 0.1,
+    "game_log_fetch_cold": 3.0,
+    "scheduled_refresh_warm": 1.0,
+}
+
+
+def measure(fn: Callable[[], object], setup: Callable[[], object] | None, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def app_startup() -> float:
+    """Time importing the app in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True, timeout=60
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(year: int, manager: str | None, repeat: int) -> dict[str, float]:
+    import app
+    from flask import render_template
+    from game_schedule import RefreshScheduler
+    import models
+    from seasons import ALL_SEASONS
+    from snapshots import SeasonSnapshot
+    import stats_store
+
+    base_season = ALL_SEASONS[year]
+    manager = (manager or base_season.managers[0]).lower()
+    stats_dir = tempfile.TemporaryDirectory(prefix="benchmark-stats-")
+    state = {}
+
+    def cold_start():
+        """Start from a fresh season, with empty in-memory caches and an empty stats store."""
+        stats_store.STATS_STORE_DIR = tempfile.mkdtemp(dir=stats_dir.name)
+        models.PLAYER_STATS_CACHE.invalidate()
+        models.SEASON_VALUES_CACHE.invalidate()
+        state["season"] = dataclasses.replace(base_season)
+
+    def cold_team():
+        cold_start()
+        state["team"] = state["season"].teams[manager]
+
+    results = {}
+    with stats_dir:
+        results["app_startup"] = statistics.median(app_startup() for _ in range(repeat))
+        results["standings_cold"] = measure(lambda: state["season"].standings, cold_start, repeat)
+        results["standings_warm"] = measure(lambda: state["season"].standings, None, repeat)
+        results["team_fetch_cold"] = measure(
+            lambda: state["team"].fetch_all_stats(), cold_team, repeat
+        )
+        results["team_fetch_warm"] = measure(lambda: state["team"].fetch_all_stats(), None, repeat)
+
+        snapshot = SeasonSnapshot.from_season(state["season"])
+        team = snapshot.team(manager)
+        with app.app.test_request_context(f"/{year}/{manager}"):
+            results["team_page_render"] = measure(
+                lambda: render_template("team.html", team=team, refreshed_at=snapshot.created_at),
+                None,
+                repeat,
+            )
+
+        # Game logs are only ingested for a season in progress.
+        game_log_ingestion, models.GAME_LOG_INGESTION = models.GAME_LOG_INGESTION, True
+        try:
+            results["game_log_fetch_cold"] = measure(
+                lambda: state["season"].fetch_all_stats(), cold_start, repeat
+            )
+        finally:
+            models.GAME_LOG_INGESTION = game_log_ingestion
+
+        def scheduled_start():
+            cold_start()
+            state["scheduler"] = RefreshScheduler(state["season"])
+            state["scheduler"].fetch_due_stats()
+
+        results["scheduled_refresh_warm"] = measure(
+            lambda: state["scheduler"].fetch_due_stats(), scheduled_start, repeat
+        )
+    return results
+
+
+def parse_threshold(value: str) -> tuple[str, float]:
+    name, _, seconds = value.partition("=")
+    if name not in DEFAULT_THRESHOLDS:
+        raise argparse.ArgumentTypeError(f"Unknown benchmark: {name}")
+    return name, float(seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from seasons import CURRENT_SEASON
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--season", type=int, default=CURRENT_SEASON.year)
+    parser.add_argument("--manager", help="Team to benchmark (default: the season's first)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per API call")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    parser.add_argument(
+        "--threshold", type=parse_threshold, action="append", default=[],
+        metavar="NAME=SECONDS", help="Override the threshold of a benchmark",
+    )
+    args = parser.parse_args(argv)
+
+    fixture = load_fixture(args.fixture)
+    if fixture is None:
+        print(f"No fixture at {args.fixture}, using synthetic stats")
+    api = OfflineStatsAPI(fixture, latency=args.latency)
+    api.install()
+    try:
+        results = run_benchmarks(args.season, args.manager, args.repeat)
+    finally:
+        api.uninstall()
+
+    thresholds = {**DEFAULT_THRESHOLDS, **dict(args.threshold)}
+    failed = False
+    print(f"{'benchmark':<22} {'median':>9} {'threshold':>9}")
+    for name, seconds in results.items():
+        ok = seconds <= thresholds[name]
+        failed |= not ok
+        print(f"{name:<22} {seconds:>8.3f}s {thresholds[name]:>8.3f}s {'ok' if ok else 'FAIL'}")
+    print(f"{api.calls} API calls")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Static export of every season's pages and API payloads.
+
+Pages are written under the output directory at the paths the app serves them
+from (``<year>/index.html``, ``<year>/<manager>/index.html``), and API payloads
+as ``api/<year>/standings.json`` and ``api/<year>/<manager>.json``, so that the
+site can be served by any static file server.
+
+Each file records a digest of everything it is rendered from in a manifest, and
+is only rendered again when that digest changes. Pages of the current season
+therefore show when their stats last changed.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Iterable
+
+from flask import Flask, render_template
+
+from models import Season
+from seasons import ALL_SEASONS, CURRENT_SEASON
+from snapshots import SeasonSnapshot, get_snapshot
+from utils.files import write_atomic
+
+MANIFEST_NAME = ".export-manifest.json"
+
+
+@dataclass(frozen=True)
+class ExportFile:
+    path: str
+    # JSON-serializable data the file is rendered from.
+    inputs: Any
+    render: Callable[[], str | bytes]
+
+
+def digest(*parts: Any) -> str:
+    data = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def directory_digest(path: str) -> str:
+    """Digest of the names and contents of every file under a directory."""
+    sha = hashlib.sha1()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            sha.update(os.path.relpath(file_path, path).encode())
+            with open(file_path, "rb") as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def render_page(app: Flask, url: str, template: str, **context) -> str:
+    with app.test_request_context(url):
+        return render_template(template, **context)
+
+
+def encode_json(payload: Any) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def season_files(app: Flask, season: Season, snapshot: SeasonSnapshot) -> list[ExportFile]:
+    year = season.year
+    refreshed_at = snapshot.created_at if season is CURRENT_SEASON else None
+    season_inputs = snapshot.content_dict()
+    files = [
+        ExportFile(
+            f"{year}/index.html",
+            season_inputs,
+            lambda: render_page(
+                app, f"/{year}", "home.html", season=snapshot, refreshed_at=refreshed_at
+            ),
+        ),
+        ExportFile(
+            f"api/{year}/standings.json",
+            season_inputs,
+            lambda: encode_json(snapshot.standings_dict()),
+        ),
+    ]
+    for team in snapshot.teams:
+        manager = team.manager.lower()
+        files.append(ExportFile(
+            f"{year}/{manager}/index.html",
+            team.to_dict(),
+            lambda team=team, manager=manager: render_page(
+                app, f"/{year}/{manager}", "team.html", team=team, refreshed_at=refreshed_at
+            ),
+        ))
+        files.append(ExportFile(
+            f"api/{year}/{manager}.json",
+            team.to_dict(),
+            lambda team=team: encode_json(team.to_dict()),
+        ))
+    return files
+
+
+def static_files(app: Flask) -> list[ExportFile]:
+    files = [
+        ExportFile(
+            "index.html",
+            CURRENT_SEASON.year,
+            lambda: f'<meta http-equiv="refresh" content="0; url=/{CURRENT_SEASON.year}">\n',
+        )
+    ]
+    for root, _, names in os.walk(app.static_folder):
+        for name in names:
+            source = os.path.join(root, name)
+            with open(source, "rb") as f:
+                content = f.read()
+            path = os.path.join("static", os.path.relpath(source, app.static_folder))
+            files.append(ExportFile(
+                path, hashlib.sha1(content).hexdigest(), lambda content=content: content
+            ))
+    return files
+
+
+def export_site(
+    app: Flask, seasons: Iterable[Season], output: str, max_workers: int = 8
+) -> tuple[int, int]:
+    """Write the given seasons' files under ``output``. Returns (written, unchanged) counts."""
+    seasons = list(seasons)
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    # Pages also depend on the templates and on the list of seasons in the navbar.
+    common_inputs = (directory_digest(app.template_folder), sorted(ALL_SEASONS))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        snapshots = list(executor.map(get_snapshot, seasons))
+        files = static_files(app)
+        for season, snapshot in zip(seasons, snapshots):
+            files.extend(season_files(app, season, snapshot))
+
+        changed = []
+        for file in files:
+            file_digest = digest(common_inputs, file.inputs)
+            path = os.path.join(output, file.path)
+            if manifest.get(file.path) != file_digest or not os.path.exists(path):
+                changed.append((file, path, file_digest))
+
+        def export_file(args: tuple[ExportFile, str, str]):
+            file, path, file_digest = args
+            write_atomic(path, file.render())
+            return file.path, file_digest
+
+        manifest.update(executor.map(export_file, changed))
+
+    write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+    logging.info(f"Exported {len(changed)} changed files to {output}")
+    return len(changed), len(files) - len(changed)
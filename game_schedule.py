@@ -0,0 +1,212 @@
+"""Refresh scheduling driven by the MLB schedule.
+
+On any given day, most rostered players' clubs are idle or their games are
+already final, so their stats cannot have changed since they were last fetched.
+:class:`RefreshScheduler` reads the schedule with a single API call per refresh
+and only refreshes the players whose club has a game in progress, or a game
+that ended since their stats were last fetched.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+import logging
+import time
+from typing import Any
+
+from constants import TEAM_ABBREVIATIONS
+import metrics
+from models import (
+    ASYNC_STATS,
+    FETCH_POOL,
+    Player,
+    Season,
+    fetch_stats,
+    load_stats_fetched_since,
+    statsapi_get,
+)
+from stats_store import get_stats_store
+
+# Prefixes of the schedule's detailed game states. Any other state (e.g. "In
+# Progress", "Delayed" or "Manager challenge") counts as a game in progress.
+FINAL_STATES = ("Final", "Game Over", "Completed Early")
+IDLE_STATES = ("Scheduled", "Pre-Game", "Warmup", "Postponed", "Cancelled", "Suspended")
+
+# Stats can lag behind a game's final state, so the clubs of a final game are
+# refreshed on this many refreshes after it ends.
+FINAL_GAME_REFRESHES = 2
+
+
+@dataclass(frozen=True)
+class Game:
+    game_id: int
+    # Abbreviations of the away and home clubs, as in Player.team.
+    teams: tuple[str, str]
+    status: str
+
+    @property
+    def is_final(self) -> bool:
+        return self.status.startswith(FINAL_STATES)
+
+    @property
+    def is_live(self) -> bool:
+        return not self.is_final and not self.status.startswith(IDLE_STATES)
+
+
+def fetch_games(start: date, end: date) -> list[Game]:
+    """Fetch the games scheduled between two dates, inclusive, with a single API call.
+
+    Like player stats, the schedule is fetched through FETCH_POOL, with a timeout,
+    or by this process's AsyncStatsClient with ASYNC_STATS.
+    """
+    params = schedule_params(start, end)
+    if ASYNC_STATS:
+        from stats_client import get_stats_loop
+
+        data = get_stats_loop().run(lambda client: client.get("schedule", params))
+    else:
+        def fetch_schedule() -> dict[str, Any]:
+            with metrics.statsapi_call("schedule"):
+                return statsapi_get("schedule", params)
+
+        data = FETCH_POOL.call(fetch_schedule)
+    return parse_games(data)
+
+
+def schedule_params(start: date, end: date) -> dict[str, Any]:
+    return {
+        "sportId": 1,
+        "startDate": start.isoformat(),
+        "endDate": end.isoformat(),
+        "fields": "dates,games,gamePk,teams,away,home,team,name,status,detailedState",
+    }
+
+
+def parse_games(data: dict[str, Any]) -> list[Game]:
+    return [
+        Game(
+            game_id=game["gamePk"],
+            teams=tuple(
+                TEAM_ABBREVIATIONS.get(name, name)
+                for name in (
+                    game["teams"]["away"]["team"]["name"],
+                    game["teams"]["home"]["team"]["name"],
+                )
+            ),
+            status=game["status"]["detailedState"],
+        )
+        for day in data.get("dates", [])
+        for game in day.get("games", [])
+    ]
+
+
+class RefreshScheduler:
+    """Chooses which of a season's players each refresh fetches stats for.
+
+    A player is refreshed when their club (from their last fetched stats) has a
+    game in progress, or a game that became final since the previous refresh.
+    Games from the day before are included, for games that end after midnight.
+    Players who were never fetched, whose last fetch failed, or who were last
+    fetched more than ``max_interval`` seconds ago (e.g. after a trade or a stat
+    correction) are refreshed regardless. When the schedule cannot be fetched,
+    every player is refreshed.
+
+    Players of busy clubs whose stats another process stored since this one's
+    previous refresh, and since their game was first seen final, are read from
+    the stats store rather than fetched again.
+    """
+
+    def __init__(self, season: Season, max_interval: float = 21600):
+        self.season = season
+        self.max_interval = max_interval
+        self._fetched_at: dict[tuple[int, str, int], float] = {}
+        # Number of refreshes since each final game ended, by game id.
+        self._final_games: dict[int, int] = {}
+        # Wall clock time of the previous refresh, comparable across processes.
+        self._refreshed_at: float | None = None
+
+    def busy_teams(self, games: list[Game]) -> set[str]:
+        """Clubs with a game in progress, or a game that ended since the previous refresh."""
+        return {
+            team
+            for game in games
+            if game.is_live
+            or (game.is_final and self._final_games.get(game.game_id, 0) < FINAL_GAME_REFRESHES)
+            for team in game.teams
+        }
+
+    def is_due(self, player: Player, busy_teams: set[str] | None, now: float) -> bool:
+        fetched_at = self._fetched_at.get(player.cache_key)
+        if player.stale or fetched_at is None or now - fetched_at > self.max_interval:
+            return True
+        if busy_teams is None:
+            return True
+        # Prior year stats of players after an injury move no longer change.
+        return player.stats_year == self.season.year and player.team in busy_teams
+
+    def changed_since(self, games: list[Game], busy_teams: set[str]) -> dict[str, float]:
+        """The wall clock time after which a fetch has each busy club's latest stats.
+
+        That is when this scheduler previously refreshed, or when the club's game
+        was first seen final by any process if later.
+        """
+        final_at = get_stats_store(self.season.year).mark_games_final(
+            game.game_id for game in games if game.is_final
+        )
+        if self._refreshed_at is None:
+            return {}
+        since: dict[str, float] = {}
+        for game in games:
+            for team in set(game.teams) & busy_teams:
+                changed = max(self._refreshed_at, final_at.get(game.game_id, 0))
+                since[team] = max(since.get(team, 0), changed)
+        return since
+
+    def fetch_due_stats(self) -> dict[tuple[int, str, int], Exception]:
+        """Fetch the stats of the season's players that may have changed since the last refresh."""
+        today = date.today()
+        try:
+            games = fetch_games(today - timedelta(days=1), today)
+        except Exception as e:
+            logging.warning(f"Failed to fetch the schedule, refreshing every player: {e!r}")
+            games, busy_teams = [], None
+        else:
+            busy_teams = self.busy_teams(games)
+
+        if ASYNC_STATS:
+            from stats_client import get_stats_loop
+
+            get_stats_loop().run(self.season.prefetch_avg_games_played_async)
+        else:
+            self.season.prefetch_avg_games_played()
+        players = [player for team in self.season.teams.values() for player in team.players]
+        now = time.monotonic()
+        due = [player for player in players if self.is_due(player, busy_teams, now)]
+        # Players of busy clubs were fetched before their last game ended, so
+        # their cached stats are out of date.
+        refetch = {
+            player.cache_key
+            for player in due
+            if busy_teams is not None and player.team in busy_teams
+        }
+        if busy_teams is not None:
+            since = self.changed_since(games, busy_teams)
+            refetch -= load_stats_fetched_since({
+                player.cache_key: since[player.team]
+                for player in due
+                if player.cache_key in refetch and player.team in since
+            })
+        logging.info(
+            f"Refreshing the stats of {len(due)} of {len(players)} players,"
+            f" bypassing caches for {len(refetch)}"
+        )
+        errors = fetch_stats(due, refetch)
+        self._refreshed_at = time.time()
+
+        for player in due:
+            if player.cache_key not in errors:
+                self._fetched_at[player.cache_key] = now
+        for game in games:
+            if game.is_final:
+                self._final_games[game.game_id] = self._final_games.get(game.game_id, 0) + 1
+        return errors
@@ -0,0 +1,160 @@
+"""In-process metrics, exposed in the Prometheus text format.
+
+Metrics are kept per process, so with several gunicorn workers each scrape of
+/metrics reports on the worker that happened to serve it.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+import threading
+import time
+from typing import Iterator
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+LabelValues = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[LabelValues, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the block takes, and report it in the Server-Timing header."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(duration, **labels)
+            record_server_timing(self.name, duration)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                for bound, count in zip(self.buckets, counts):
+                    le = format_labels(labels, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                le = format_labels(labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{le} {counts[-1]}")
+                lines.append(f"{self.name}_sum{format_labels(labels)} {self._sums[labels]}")
+                lines.append(f"{self.name}_count{format_labels(labels)} {counts[-1]}")
+        return lines
+
+
+STATSAPI_REQUEST_SECONDS = Histogram(
+    "statsapi_request_seconds", "Duration of MLB Stats API calls, by endpoint."
+)
+STATSAPI_ERRORS = Counter("statsapi_errors_total", "Failed MLB Stats API calls, by endpoint.")
+RATING_SECONDS = Histogram("rating_seconds", "Duration of team rating computations.")
+PROJECTION_SECONDS = Histogram(
+    "projection_seconds", "Duration of Monte Carlo projections of the standings."
+)
+TEMPLATE_RENDER_SECONDS = Histogram(
+    "template_render_seconds", "Duration of template rendering, by template."
+)
+REQUEST_SECONDS = Histogram("http_request_seconds", "Duration of HTTP requests, by endpoint.")
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups, by cache and result.")
+
+METRICS: list[Counter | Histogram] = [
+    STATSAPI_REQUEST_SECONDS,
+    STATSAPI_ERRORS,
+    RATING_SECONDS,
+    PROJECTION_SECONDS,
+    TEMPLATE_RENDER_SECONDS,
+    REQUEST_SECONDS,
+    CACHE_REQUESTS,
+]
+
+
+def count_cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def statsapi_call(endpoint: str) -> Iterator[None]:
+    try:
+        with STATSAPI_REQUEST_SECONDS.time(endpoint=endpoint):
+            yield
+    except Exception:
+        STATSAPI_ERRORS.inc(endpoint=endpoint)
+        raise
+
+
+def render() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Timings recorded while serving the current request, for the Server-Timing header.
+_server_timings = threading.local()
+
+
+def start_server_timing():
+    _server_timings.entries = []
+
+
+def record_server_timing(name: str, duration: float):
+    entries = getattr(_server_timings, "entries", None)
+    if entries is not None:
+        entries.append((name, duration))
+
+
+def finish_server_timing() -> str:
+    """Return the Server-Timing header value for the current request, and stop recording."""
+    entries = getattr(_server_timings, "entries", None) or []
+    _server_timings.entries = None
+    totals: dict[str, float] = defaultdict(float)
+    for name, duration in entries:
+        totals[name] += duration
+    return ", ".join(f"{name};dur={duration * 1000:.1f}" for name, duration in totals.items())
@@ -1,18 +1,131 @@
 from __future__ import annotations
 
-from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
+import asyncio
+from collections import defaultdict
 from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import partial
 import logging
-from types import SimpleNamespace
-from typing import Any, Dict, List
-from utils.cached_property import cached_property
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Collection, Dict, Iterable, List
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.fetch_pool import FetchPool
+from utils.ttl_cache import TTLCache
 
-import statsapi
-import yaml
+import requests
+from statsapi.endpoints import ENDPOINTS
 
 from constants import Position, Role, TEAM_ABBREVIATIONS
+import metrics
 from player_id_map import MLBID_TO_NAME
+from ratings import SeasonRatings, rate_teams
+from rosters import load_roster, roster_path
+from stats_store import get_stats_store
+
+if TYPE_CHECKING:
+    from stats_client import AsyncStatsClient
+
+
+# Process-wide cache of RawStats, keyed by (mlb_id, stats_group, stats_year).
+PLAYER_STATS_CACHE = TTLCache(
+    ttl=float(os.environ.get("PLAYER_STATS_CACHE_TTL", 600)),
+    maxsize=int(os.environ.get("PLAYER_STATS_CACHE_SIZE", 4096)),
+)
+
+# Process-wide cache of values derived from each season's standings, keyed by
+# (year, name). Like player stats, they are shared with other workers through
+# the stats store. They are refetched along with the player stats; the TTL only
+# bounds the age of a value read without a refresh.
+SEASON_VALUES_CACHE = TTLCache(
+    ttl=float(os.environ.get("SEASON_VALUES_CACHE_TTL", 10800)), maxsize=64
+)
+
+# Per-player circuits: players whose stats repeatedly fail to be fetched are
+# skipped for a while, and keep their last fetched stats in the meantime.
+STATS_CIRCUIT_BREAKER = CircuitBreaker(
+    failure_threshold=int(os.environ.get("STATS_CIRCUIT_FAILURES", 3)),
+    reset_timeout=float(os.environ.get("STATS_CIRCUIT_RESET", 600)),
+)
+
+# Whether current season stats are summed from ingested game logs, fetching only
+# the games played since the last refresh, instead of refetching season totals.
+GAME_LOG_INGESTION = os.environ.get("GAME_LOG_INGESTION", "").lower() in ("1", "true", "yes")
+
+# Whether stats are fetched by an asyncio client over a keep-alive connection
+# pool (see stats_client.py) instead of by FETCH_POOL's threads.
+ASYNC_STATS = os.environ.get("ASYNC_STATS", "").lower() in ("1", "true", "yes")
+
+# Most past dates whose standings each refresh fetches, to backfill the average
+# games played on the dates of games ingested before the first refresh.
+AVG_GAMES_PLAYED_BACKFILL_DAYS = int(os.environ.get("AVG_GAMES_PLAYED_BACKFILL_DAYS", 14))
+
+# Maximum number of players whose stats are requested in a single API call.
+BULK_STATS_BATCH_SIZE = 100
+
+# Seconds after which a call to the MLB Stats API times out. The HTTP request
+# itself times out too, so that a stalled connection frees its worker thread.
+FETCH_TIMEOUT = float(os.environ.get("FETCH_TIMEOUT", 15))
+
+# Process-wide pool for all calls to the MLB Stats API.
+FETCH_POOL = FetchPool(
+    max_workers=int(os.environ.get("FETCH_POOL_SIZE", 4)),
+    timeout=FETCH_TIMEOUT,
+    retries=int(os.environ.get("FETCH_RETRIES", 2)),
+)
+
+
+# MLB Stats API keys of the stats used by the league rules. The rest of each
+# player's stats payload is dropped when it is parsed.
+STAT_KEYS = (
+    "gamesPlayed",
+    "atBats",
+    "runs",
+    "hits",
+    "homeRuns",
+    "rbi",
+    "stolenBases",
+    "outs",
+    "earnedRuns",
+    "wins",
+    "saves",
+    "strikeOuts",
+    "baseOnBalls",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RawStats:
+    """A player's stats as fetched from the MLB Stats API, which are never modified.
+
+    Stats adjusted by league rules (e.g. for injury moves) are derived from these
+    by the Player subclasses, so that fetched stats can be shared between players,
+    caches and threads. Only the stats in STAT_KEYS are kept, in slots named
+    after their API keys.
+    """
+
+    team: str = ""
+    gamesPlayed: int = 0
+    atBats: int = 0
+    runs: int = 0
+    hits: int = 0
+    homeRuns: int = 0
+    rbi: int = 0
+    stolenBases: int = 0
+    outs: int = 0
+    earnedRuns: int = 0
+    wins: int = 0
+    saves: int = 0
+    strikeOuts: int = 0
+    baseOnBalls: int = 0
+
+    @classmethod
+    def from_api(cls, team: str | None, stats: Dict[str, Any]) -> "RawStats":
+        return cls(team or "", *(stats.get(key, 0) for key in STAT_KEYS))
+
+    def to_dict(self) -> dict[str, int]:
+        return {key: getattr(self, key) for key in STAT_KEYS}
 
 
 @dataclass
@@ -32,41 +145,243 @@ class Season:
     year: int
     managers: list[str]
     rules: Rules
-    teams: dict[str, "Team"] = field(init=False)
     league_id: int = 103  # Defaults to American League
 
     # Decimal precision of team ratings.
     # Defaults to 1 but can be increased in the event of very tight standings.
     rating_precision: int = 1
 
-    def __post_init__(self):
-        self.teams = {manager.lower(): Team(manager, self) for manager in self.managers}
+    # Completed seasons are served from a frozen snapshot instead of live stats.
+    completed: bool = False
 
-    def fetch_all_stats(self):
-        teams = self.teams.values()
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(lambda t: t.fetch_all_stats(), t) for t in teams]
-            wait(futures, return_when=ALL_COMPLETED)
+    _teams: dict[str, "Team"] | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    _teams_lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def teams(self) -> dict[str, "Team"]:
+        # Rosters are parsed on first access rather than at import.
+        if self._teams is None:
+            with self._teams_lock:
+                if self._teams is None:
+                    self._teams = {
+                        manager.lower(): Team(manager, self) for manager in self.managers
+                    }
+        return self._teams
+
+    def has_manager(self, manager: str) -> bool:
+        return manager.lower() in (m.lower() for m in self.managers)
+
+    @property
+    def snapshot_path(self) -> str:
+        return f"data/{self.year}/snapshot.json"
+
+    def fetch_all_stats(self) -> dict[tuple[int, str, int], Exception]:
+        """Fetch every player's stats, and avg_games_played along with them."""
+        if ASYNC_STATS:
+            from stats_client import get_stats_loop
+
+            return get_stats_loop().run(self.fetch_all_stats_async)
+        self.prefetch_avg_games_played()
+        return fetch_stats([player for team in self.teams.values() for player in team.players])
+
+    async def fetch_all_stats_async(
+        self, client: "AsyncStatsClient"
+    ) -> dict[tuple[int, str, int], Exception]:
+        """Async counterpart of fetch_all_stats, with every call made by the given client."""
+        players = [player for team in self.teams.values() for player in team.players]
+        _, errors = await asyncio.gather(
+            self.prefetch_avg_games_played_async(client), fetch_stats_async(players, client)
+        )
+        return errors
 
     @property
     def standings(self) -> list["Team"]:
         self.fetch_all_stats()
-        return sorted(self.teams.values(), key=lambda t: t.rating, reverse=True)
+        teams = list(self.teams.values())
+        ratings = self.rate(teams)
+        order = sorted(range(len(teams)), key=lambda i: ratings.rating[i], reverse=True)
+        return [teams[i] for i in order]
 
-    @cached_property(ttl=10800)
+    def rate(self, teams: list["Team"] | None = None) -> SeasonRatings:
+        """Compute stats and ratings for all teams (or the given ones) from fetched stats."""
+        if teams is None:
+            teams = list(self.teams.values())
+        return rate_teams(teams, self.rules, self.avg_games_played)
+
+    @property
     def avg_games_played(self) -> float:
-        standings_data = statsapi.standings_data(self.league_id, season=self.year)
-        total_games = 0
-        teams = 0
-        for _, division in standings_data.items():
-            for team in division.get("teams", []):
-                teams += 1
-                total_games += team.get("w", 0)
-                total_games += team.get("l", 0)
-        result = total_games / teams
+        # Concurrent misses share a single fetch, in this worker, and the fetched
+        # value is shared with other workers through the stats store.
+        key = (self.year, "avg_games_played")
+        return SEASON_VALUES_CACHE.get(key, self.fetch_avg_games_played)
+
+    def prefetch_avg_games_played(self):
+        """Refetch avg_games_played along with the player stats it weighs.
+
+        Ratings would otherwise combine fresh stats with the progress of up to
+        SEASON_VALUES_CACHE.ttl ago. A completed season's value no longer changes,
+        so it is only fetched if not cached. If the fetch fails, the last value
+        fetched is kept.
+
+        With GAME_LOG_INGESTION, the values of past dates are also backfilled.
+        """
+        if self.completed and self.load_avg_games_played():
+            return
+        try:
+            standings_data = FETCH_POOL.call(self.fetch_standings_data)
+            result = self.record_avg_games_played(average_games_played(standings_data))
+        except Exception as e:
+            self.keep_last_avg_games_played(e)
+        else:
+            SEASON_VALUES_CACHE.set((self.year, "avg_games_played"), result)
+        self.backfill_avg_games_played()
+
+    async def prefetch_avg_games_played_async(self, client: "AsyncStatsClient"):
+        """Async counterpart of prefetch_avg_games_played.
+
+        Only the API call runs on the event loop; stats store calls run on
+        worker threads.
+        """
+        if self.completed and await asyncio.to_thread(self.load_avg_games_played):
+            return
+        try:
+            standings_data = await client.standings_data(self.league_id, self.year)
+            result = await asyncio.to_thread(
+                self.record_avg_games_played, average_games_played(standings_data)
+            )
+        except Exception as e:
+            await asyncio.to_thread(self.keep_last_avg_games_played, e)
+        else:
+            SEASON_VALUES_CACHE.set((self.year, "avg_games_played"), result)
+        await self.backfill_avg_games_played_async(client)
+
+    def backfill_avg_games_played(self):
+        """Record the average games played on past dates of ingested games, for as_of standings.
+
+        Standings as of a date are only ever computed from stored values, so that
+        pages never call the API. Game logs are ingested back to opening day,
+        while values are only recorded by refreshes, so each refresh fetches the
+        standings of up to AVG_GAMES_PLAYED_BACKFILL_DAYS dates still missing one.
+        """
+        days = self.avg_games_played_backfill_dates()
+        if not days:
+            return
+        results, errors = FETCH_POOL.run_all(
+            {day: partial(self.fetch_standings_data, day) for day in days}
+        )
+        self.record_past_avg_games_played(results, errors)
+
+    async def backfill_avg_games_played_async(self, client: "AsyncStatsClient"):
+        """Async counterpart of backfill_avg_games_played."""
+        days = await asyncio.to_thread(self.avg_games_played_backfill_dates)
+        if not days:
+            return
+        results, errors = await client.run_all({
+            day: partial(client.standings_data, self.league_id, self.year, format_api_date(day))
+            for day in days
+        })
+        await asyncio.to_thread(self.record_past_avg_games_played, results, errors)
+
+    def avg_games_played_backfill_dates(self) -> list[date]:
+        """The oldest dates since the first ingested game without a recorded value."""
+        if not GAME_LOG_INGESTION or self.completed:
+            return []
+        store = get_stats_store(self.year)
+        first_game_date = store.get_first_game_date()
+        if first_game_date is None:
+            return []
+        recorded = store.get_value_dates("avg_games_played")
+        days = []
+        day, today = date.fromisoformat(first_game_date), date.today()
+        while day < today and len(days) < AVG_GAMES_PLAYED_BACKFILL_DAYS:
+            if day.isoformat() not in recorded:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def record_past_avg_games_played(
+        self, results: dict[date, dict], errors: dict[date, Exception]
+    ):
+        store = get_stats_store(self.year)
+        for day, standings_data in results.items():
+            store.put_value(
+                f"avg_games_played@{day.isoformat()}", average_games_played(standings_data)
+            )
+        if errors:
+            logging.warning(
+                f"Failed to fetch {self.year} standings as of {len(errors)} past dates:"
+                f" {next(iter(errors.values()))!r}"
+            )
+
+    def load_avg_games_played(self) -> bool:
+        """Whether avg_games_played is cached, after loading it from the stats store if fresh."""
+        key = (self.year, "avg_games_played")
+        hit = key in SEASON_VALUES_CACHE
+        metrics.count_cache_lookup("season_values", hit)
+        if hit:
+            return True
+        stored = get_stats_store(self.year).get_value(
+            "avg_games_played", max_age=SEASON_VALUES_CACHE.ttl
+        )
+        if stored is None:
+            return False
+        value, age = stored
+        SEASON_VALUES_CACHE.set(key, value, age=age)
+        return True
+
+    def keep_last_avg_games_played(self, error: Exception):
+        """Keep using the last fetched value after a failed fetch, until the next refresh."""
+        stored = get_stats_store(self.year).get_value("avg_games_played", max_age=0)
+        if stored is None:
+            raise error
+        logging.warning(
+            f"Failed to fetch {self.year} standings, using the last average games played:"
+            f" {error!r}"
+        )
+        SEASON_VALUES_CACHE.set((self.year, "avg_games_played"), stored[0])
+
+    def fetch_avg_games_played(self) -> float:
+        """The value stored by any worker within the TTL, or else a freshly fetched one."""
+        store = get_stats_store(self.year)
+        stored = store.get_value("avg_games_played", max_age=SEASON_VALUES_CACHE.ttl)
+        if stored is not None:
+            return stored[0]
+        standings_data = FETCH_POOL.call(self.fetch_standings_data)
+        return self.record_avg_games_played(average_games_played(standings_data))
+
+    def record_avg_games_played(self, result: float) -> float:
         logging.info(f"Computed average games played: {result}")
+        store = get_stats_store(self.year)
+        store.put_value("avg_games_played", result)
+        # Also kept by date, for standings as of a past date.
+        store.put_value(f"avg_games_played@{date.today().isoformat()}", result)
         return result
 
+    def avg_games_played_as_of(self, as_of: date) -> float:
+        """The average games played last recorded in the stats store up to a date.
+
+        Values of dates before the first refresh are backfilled by refreshes (see
+        backfill_avg_games_played). Raises LookupError if none was recorded by
+        then, rather than calling the API from a page view.
+        """
+        stored = get_stats_store(self.year).get_value_as_of("avg_games_played", as_of.isoformat())
+        if stored is None:
+            raise LookupError(f"No {self.year} standings were recorded by {as_of.isoformat()}.")
+        return stored
+
+    def fetch_standings_data(self, as_of: date | None = None) -> dict:
+        """Each division's teams and their records, currently or at the end of a date."""
+        params = standings_params(
+            self.league_id, self.year, format_api_date(as_of) if as_of else None
+        )
+        with metrics.statsapi_call("standings"):
+            data = statsapi_get("standings", params)
+        return parse_standings_data(data)
+
     @property
     def progress(self) -> float:
         return self.avg_games_played / 162
@@ -79,6 +394,50 @@ class Season:
         return self.year - 1
 
 
+def format_api_date(day: date) -> str:
+    return day.strftime("%m/%d/%Y")
+
+
+def standings_params(league_id: int, season: int, date: str | None = None) -> dict[str, Any]:
+    params = {
+        "leagueId": league_id,
+        "season": season,
+        "standingsTypes": "regularSeason",
+        "hydrate": "team(division)",
+        "fields": "records,teamRecords,team,name,id,division,wins,losses",
+    }
+    if date is not None:
+        params["date"] = date
+    return params
+
+
+def parse_standings_data(data: dict[str, Any]) -> dict[int, dict[str, Any]]:
+    """Each division's teams and their records, as returned by ``statsapi.standings_data``."""
+    divisions: dict[int, dict[str, Any]] = {}
+    for record in data.get("records", []):
+        for team in record["teamRecords"]:
+            division = team["team"]["division"]
+            divisions.setdefault(division["id"], {"div_name": division["name"], "teams": []})
+            divisions[division["id"]]["teams"].append({
+                "name": team["team"]["name"],
+                "w": team["wins"],
+                "l": team["losses"],
+                "team_id": team["team"]["id"],
+            })
+    return divisions
+
+
+def average_games_played(standings_data: dict) -> float:
+    total_games = 0
+    teams = 0
+    for _, division in standings_data.items():
+        for team in division.get("teams", []):
+            teams += 1
+            total_games += team.get("w", 0)
+            total_games += team.get("l", 0)
+    return total_games / teams
+
+
 @dataclass
 class Team:
     manager: str
@@ -90,79 +449,36 @@ class Team:
     minors_pitchers: "PitcherList" = field(init=False)
 
     def __post_init__(self):
-        path = f"data/{self.season.year}/teams/{self.manager.lower()}.yaml"
+        # Rosters are validated when they are compiled (see rosters.py).
         try:
-            with open(path, "r") as f:
-                data = yaml.safe_load(f)
-            self.starters = self.parse_starters(data["starters"])
-            self.bench = self.parse_bench(data["bench"])
-            self.rotation = self.parse_rotation(data["rotation"])
-            self.minors_hitters, self.minors_pitchers = self.parse_minors(
-                data["minors"]
-            )
+            roster = load_roster(self.season, self.manager)
         except FileNotFoundError:
-            logging.warning(f"Team file not found: {path}")
+            logging.warning(f"Team file not found: {roster_path(self.season, self.manager)}")
+            return
+        self.starters = self.parse_hitters(roster["starters"], role=Role.STARTER)
+        self.bench = self.parse_hitters(roster["bench"], role=Role.BENCH)
+        self.rotation = self.parse_rotation(roster["rotation"])
+        self.minors_hitters, self.minors_pitchers = self.parse_minors(roster["minors"])
 
     def __repr__(self):
         return f"{self.__class__.__name__}(manager='{self.manager}')"
 
-    def parse_starters(self, data: Dict[str, Any] | List[Dict[str, str]]) -> "HitterList":
-        if not len(data) == 9:
-            raise ValueError("Expected 9 starters")
-        
-        result = self.parse_hitters(data, role=Role.STARTER)
-
-        position_counts = Counter(hitter.position for hitter in result)
-        assert position_counts == {
-            Position.FIRST_BASE: 1,
-            Position.SECOND_BASE: 1,
-            Position.SHORTSTOP: 1,
-            Position.THIRD_BASE: 1,
-            Position.CATCHER: 1,
-            Position.OUTFIELD: 3,
-            Position.DESIGNATED_HITTER: 1,
-        }, f"[{self.manager}] Starter position counts failed validation!"
-        
-        return result
-
-
-
-    def parse_bench(self, data: list[list[str]]) -> "HitterList":
-        num_players_expected = self.season.rules.num_reserve_hitters
-        if not len(data) == num_players_expected:
-            raise ValueError(
-                f"Expected {num_players_expected} bench hitters, not {len(data)}"
-            )
-        
-        return self.parse_hitters(data, role=Role.BENCH)
-
-    def parse_hitters(self, data, role: Role) -> "HitterList":
+    def parse_hitters(self, data: list[dict[str, Any]], role: Role) -> "HitterList":
         return HitterList(
             (Hitter.from_dict(hitter, self.season) for hitter in data),
             role=role,
         )
 
-    def parse_rotation(self, data: list[str]) -> "PitcherList":
-        num_players_expected = self.season.rules.num_pitchers
-        if len(data) != num_players_expected:
-            raise ValueError(
-                f"Expected {self.season.rules.num_pitchers} pitchers, not {len(data)}"
-            )
+    def parse_rotation(self, data: list[dict[str, Any]]) -> "PitcherList":
         return PitcherList(Pitcher.from_dict(pitcher, self.season) for pitcher in data)
 
-    def parse_minors(self, data: list[list[str]]) -> tuple["HitterList", "PitcherList"]:
-        if len(data) > 5:
-            raise ValueError("Must have at most 5 players in minors")
+    def parse_minors(self, data: list[dict[str, Any]]) -> tuple["HitterList", "PitcherList"]:
         hitters, pitchers = HitterList(role=Role.MINORS), PitcherList()
-
         for player in data:
             if player["pos"] == "P":
                 pitchers.append(Pitcher.from_dict(player, self.season))
             else:
                 hitters.append(Hitter.from_dict(player, self.season))
-        
-        # if len(pitchers) > 3:
-        #     raise ValueError("Must have at most 3 pitchers in minors")
         return hitters, pitchers
 
     @property
@@ -175,62 +491,39 @@ class Team:
             *self.minors_pitchers,
         ]
 
-    def fetch_all_stats(self):
-        with ThreadPoolExecutor() as executor:
-            executor.map(lambda p: p.fetch_stats(), self.players)
-
-    @property
-    def rating(self) -> float:
-        return self.offense + self.pitching + self.innings_bonus_or_penalty
-
-    @property
-    def hitting_totals(self):
-        starters = self.starters.get_summary_stats()
-        bench = self.bench.get_summary_stats()
-        totals = {}
-        for v in vars(bench):
-            if v in {"name", "formatted_avg"}:
-                continue
-            totals[v] = getattr(starters, v) + getattr(bench, v) / 2
-        return SimpleNamespace(**totals)
-
-    @property
-    def offense(self) -> float:
-        stats = self.hitting_totals
-        rating = (stats.runs + stats.rbi) / 2 + stats.hr / 4 + stats.sb / 5
-        avg = stats.hits / stats.ab if stats.ab else 0.0
-        rating += (avg * 1000 - 250) * self.season.progress
-        return rating
-
-    @property
-    def innings_bonus_or_penalty(self) -> float:
-        stats = self.rotation.get_summary_stats()
-        rules = self.season.rules
-        innings_delta = stats.ip - (rules.team_innings_threshold * self.season.progress)
-        if innings_delta >= 0:
-            return innings_delta * rules.innings_surplus_multiplier
-        else:
-            return innings_delta * rules.innings_deficit_multiplier
+    def fetch_all_stats(self) -> dict[tuple[int, str, int], Exception]:
+        return fetch_stats(self.players)
 
-    @property
-    def pitching(self) -> float:
-        stats = self.rotation.get_summary_stats()
-        rating = stats.wins + stats.saves / 3 + (stats.strikeouts - stats.walks) / 10
-        era = 9 * stats.er / stats.ip if stats.ip else 0.0
-        rating -= era * self.season.avg_games_played
-        return rating
+    async def fetch_all_stats_async(
+        self, client: "AsyncStatsClient"
+    ) -> dict[tuple[int, str, int], Exception]:
+        return await fetch_stats_async(self.players, client)
 
 
 class Player:
+    __slots__ = (
+        "mlb_id",
+        "name",
+        "position",
+        "season",
+        "stats_year",
+        "injury_move",
+        "minors_penalty",
+        "raw",
+        "stale",
+    )
+
     mlb_id: int
     name: str
     position: Position
     season: Season
     stats_year: int
     stats_group: str
-    team: str = ""
-    stats: Dict[str, Any] = {}
-    multiplier: float = 1
+    injury_move: bool
+    minors_penalty: bool
+    raw: RawStats
+    # Whether the last attempt to refresh the player's stats failed.
+    stale: bool
 
     def __init__(
         self,
@@ -239,46 +532,462 @@ class Player:
         position: Position,
         season: Season,
         stats_year: int,
-        multiplier: float = 1,
+        injury_move: bool = False,
+        minors_penalty: bool = False,
     ):
         self.mlb_id = mlb_id
         self.name = name
         self.position = position
         self.season = season
         self.stats_year = stats_year
-        self.multiplier = multiplier
+        self.injury_move = injury_move
+        self.minors_penalty = minors_penalty
+        self.raw = RawStats()
+        self.stale = False
 
     def __repr__(self):
         attrs = ["name", "position", "mlb_id"]
         values = ", ".join([f"{attr}={getattr(self, attr)}" for attr in attrs])
         return f"{self.__class__.__name__}({values})"
 
+    def multiplier_at(self, progress: float) -> float:
+        """The share of the player's stats that counts, at the given season progress."""
+        multiplier = 1.0
+        if self.injury_move:
+            multiplier = 0.7 * progress
+        if self.minors_penalty:
+            multiplier *= 0.9
+        return multiplier
+
     @property
     def mlb_profile_url(self) -> str:
         return f"https://www.mlb.com/player/{self.mlb_id}"
 
-    @property
-    def notes(self) -> str:
+    def notes_with(self, multiplier: float) -> str:
         notes = ""
-        if self.multiplier != 1:
-            notes += f"{round(self.multiplier * 100)}%"
+        if multiplier != 1:
+            notes += f"{round(multiplier * 100)}%"
         if self.stats_year != self.season.year:
             notes += f" of {self.stats_year}"
         return notes
 
+    @property
+    def team(self) -> str:
+        return self.raw.team
+
+    @property
+    def cache_key(self) -> tuple[int, str, int]:
+        return self.mlb_id, self.stats_group, self.stats_year
+
+    @property
+    def uses_game_logs(self) -> bool:
+        return GAME_LOG_INGESTION and not self.season.completed and (
+            self.stats_year == self.season.year
+        )
+
     def fetch_stats(self):
-        data = statsapi.player_stat_data(
-            self.mlb_id, group=self.stats_group, type="yearByYear"
+        self.raw = PLAYER_STATS_CACHE.get(self.cache_key, self.fetch_raw_stats)
+
+    def fetch_raw_stats(self) -> RawStats:
+        store = get_stats_store(self.stats_year)
+        stored = store.get_player_stats([self.cache_key], max_age=PLAYER_STATS_CACHE.ttl)
+        if self.cache_key in stored:
+            team, stats, _ = stored[self.cache_key]
+            return RawStats.from_api(team, stats)
+
+        if not STATS_CIRCUIT_BREAKER.allow(self.cache_key):
+            raise CircuitOpenError(f"Circuit open for {self.cache_key}")
+        fetch = fetch_bulk_game_logs if self.uses_game_logs else fetch_bulk_stats
+        try:
+            results = FETCH_POOL.call(
+                lambda: fetch([self.mlb_id], self.stats_group, self.stats_year)
+            )
+            raw = results[self.mlb_id]
+        except Exception:
+            STATS_CIRCUIT_BREAKER.record_failure(self.cache_key)
+            raise
+        STATS_CIRCUIT_BREAKER.record_success(self.cache_key)
+        store.put_player_stats({self.cache_key: (raw.team, raw.to_dict())})
+        return raw
+
+
+def fetch_bulk_stats(
+    mlb_ids: list[int], stats_group: str, stats_year: int
+) -> dict[int, RawStats]:
+    """Fetch one season of stats for many players with a single API call."""
+    with metrics.statsapi_call("people"):
+        data = statsapi_get("people", bulk_stats_params(mlb_ids, stats_group, stats_year))
+    return parse_bulk_stats(data, stats_year)
+
+
+def statsapi_get(endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Like ``statsapi.get``, for endpoints without path parameters, but with a timeout.
+
+    ``statsapi.get`` waits on the connection indefinitely, so a stalled call would
+    hold its FETCH_POOL worker until the process restarts.
+    """
+    url = ENDPOINTS[endpoint]["url"].replace("{ver}", "v1")
+    response = requests.get(url, params=params, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def bulk_stats_params(mlb_ids: list[int], stats_group: str, stats_year: int) -> dict[str, str]:
+    hydrate = f"currentTeam,stats(group=[{stats_group}],type=[season],season={stats_year})"
+    return {"personIds": ",".join(str(i) for i in mlb_ids), "hydrate": hydrate}
+
+
+def parse_bulk_stats(data: dict[str, Any], stats_year: int) -> dict[int, RawStats]:
+    results = {}
+    for person in data.get("people", []):
+        team = current_team(person)
+        # Players who changed teams have a split per team plus a combined one.
+        stats = [
+            split["stat"]
+            for group in person.get("stats", [])
+            for split in group.get("splits", [])
+            if int(split.get("season", 0)) == stats_year
+        ]
+        stats = max(stats, key=lambda s: s.get("gamesPlayed", 0), default={})
+        results[person["id"]] = RawStats.from_api(team, stats)
+    return results
+
+
+def current_team(person: dict[str, Any]) -> str | None:
+    team = person.get("currentTeam", {}).get("name")
+    return TEAM_ABBREVIATIONS.get(team, team)
+
+
+def fetch_bulk_game_logs(
+    mlb_ids: list[int], stats_group: str, stats_year: int
+) -> dict[int, RawStats]:
+    """Ingest many players' new games with a single API call, and return their season totals.
+
+    Only games since the earliest date up to which the players' games were
+    ingested are fetched. Games from that date are fetched again, in case they
+    were still in progress. New games are added to the stats store, and each
+    player's totals are summed from all their stored games.
+    """
+    params = game_log_params(mlb_ids, stats_group, stats_year)
+    fetched_on = date.today()
+    with metrics.statsapi_call("people"):
+        data = statsapi_get("people", params)
+    return ingest_game_logs(data, stats_group, stats_year, fetched_on)
+
+
+def game_log_params(mlb_ids: list[int], stats_group: str, stats_year: int) -> dict[str, str]:
+    keys = [(mlb_id, stats_group, stats_year) for mlb_id in mlb_ids]
+    ingested = get_stats_store(stats_year).get_ingested_through(keys)
+    stats = f"group=[{stats_group}],type=[gameLog],season={stats_year}"
+    if len(ingested) == len(keys):
+        stats += f",startDate={min(ingested.values())}"
+    hydrate = f"currentTeam,stats({stats})"
+    return {"personIds": ",".join(str(i) for i in mlb_ids), "hydrate": hydrate}
+
+
+def ingest_game_logs(
+    data: dict[str, Any], stats_group: str, stats_year: int, fetched_on: date
+) -> dict[int, RawStats]:
+    """Add the games in a gameLog response to the stats store, and return the season totals."""
+    store = get_stats_store(stats_year)
+    games = {}
+    for person in data.get("people", []):
+        team = current_team(person)
+        games[(person["id"], stats_group, stats_year)] = team or "", [
+            (
+                split["game"]["gamePk"],
+                split["date"],
+                RawStats.from_api(team, split["stat"]).to_dict(),
+            )
+            for group in person.get("stats", [])
+            for split in group.get("splits", [])
+        ]
+    # Games dated up to the day before are complete, unless listed again later.
+    store.put_games(games, ingested_through=(fetched_on - timedelta(days=1)).isoformat())
+    return {
+        mlb_id: RawStats.from_api(team, totals)
+        for (mlb_id, _, _), (team, totals) in store.get_game_totals(games.keys()).items()
+    }
+
+
+async def fetch_people_async(
+    client: "AsyncStatsClient",
+    mlb_ids: list[int],
+    stats_group: str,
+    stats_year: int,
+    game_logs: bool,
+) -> dict[int, RawStats]:
+    """Async counterpart of fetch_bulk_game_logs (if ``game_logs``) or fetch_bulk_stats.
+
+    Stats store calls run on worker threads, so they never block the event loop.
+    """
+    if game_logs:
+        params = await asyncio.to_thread(game_log_params, mlb_ids, stats_group, stats_year)
+        fetched_on = date.today()
+        data = await client.get("people", params)
+        return await asyncio.to_thread(
+            ingest_game_logs, data, stats_group, stats_year, fetched_on
+        )
+    data = await client.get("people", bulk_stats_params(mlb_ids, stats_group, stats_year))
+    return parse_bulk_stats(data, stats_year)
+
+
+def load_game_log_totals(players: Iterable[Player], as_of: date):
+    """Set players' stats to their totals over the games ingested up to a date.
+
+    Players on prior year stats after an injury move get their last stored
+    season totals. Nothing is fetched from the MLB Stats API.
+    """
+    by_year: dict[int, list[Player]] = defaultdict(list)
+    for player in players:
+        by_year[player.stats_year].append(player)
+    for stats_year, year_players in by_year.items():
+        store = get_stats_store(stats_year)
+        totals = store.get_game_totals(
+            [player.cache_key for player in year_players], as_of.isoformat()
+        )
+        prior_year_stats = store.get_player_stats(
+            [p.cache_key for p in year_players if p.stats_year != p.season.year], max_age=0
+        )
+        for player in year_players:
+            team, stats = "", {}
+            if player.cache_key in totals:
+                team, stats = totals[player.cache_key]
+            elif player.cache_key in prior_year_stats:
+                team, stats, _ = prior_year_stats[player.cache_key]
+            player.raw = RawStats.from_api(team, stats)
+
+
+def prefetch_stats(
+    players: Iterable[Player], refetch: Collection[tuple[int, str, int]] = ()
+) -> dict[tuple[int, str, int], Exception]:
+    """Load stats for all uncached players into PLAYER_STATS_CACHE in bulk.
+
+    Stats still fresh in the on-disk stats store (e.g. fetched by another worker)
+    are loaded from there. The rest are fetched with players grouped by
+    (stats_group, stats_year), so that players using prior year stats after an
+    injury move are fetched alongside the rest, and written back to the store.
+    Players whose cache key is in ``refetch`` are fetched even if their stats are
+    cached. Players whose circuit is open are skipped. Returns the error for each
+    player whose stats could not be fetched, by cache key.
+
+    With ASYNC_STATS, the batches are fetched by this process's AsyncStatsClient
+    rather than by FETCH_POOL.
+    """
+    errors, batches = plan_stats_fetches(players, refetch)
+    if ASYNC_STATS:
+        from stats_client import get_stats_loop
+
+        results, batch_errors = get_stats_loop().run(
+            lambda client: client.run_all(async_stats_fetches(client, batches))
+        )
+    else:
+        results, batch_errors = FETCH_POOL.run_all({
+            (batch, stats_group, stats_year): (
+                lambda args=(list(batch), stats_group, stats_year), game_logs=game_logs: (
+                    fetch_bulk_game_logs(*args) if game_logs else fetch_bulk_stats(*args)
+                )
+            )
+            for (batch, stats_group, stats_year), game_logs in batches.items()
+        })
+    record_fetched_stats(results, batch_errors, errors)
+    return errors
+
+
+async def prefetch_stats_async(
+    players: Iterable[Player],
+    client: "AsyncStatsClient",
+    refetch: Collection[tuple[int, str, int]] = (),
+) -> dict[tuple[int, str, int], Exception]:
+    """Async counterpart of prefetch_stats, with every batch fetched by the given client."""
+    errors, batches = await asyncio.to_thread(plan_stats_fetches, players, refetch)
+    results, batch_errors = await client.run_all(async_stats_fetches(client, batches))
+    await asyncio.to_thread(record_fetched_stats, results, batch_errors, errors)
+    return errors
+
+
+def async_stats_fetches(
+    client: "AsyncStatsClient", batches: dict[tuple[tuple[int, ...], str, int], bool]
+) -> dict[tuple[tuple[int, ...], str, int], Callable[[], Awaitable[dict[int, RawStats]]]]:
+    return {
+        (batch, stats_group, stats_year): partial(
+            fetch_people_async, client, list(batch), stats_group, stats_year, game_logs
         )
-        self.team = data.get("current_team")
-        self.team = TEAM_ABBREVIATIONS.get(self.team, self.team)
-        results = data.get("stats", [])
-        stats = [s["stats"] for s in results if int(s["season"]) == self.stats_year]
-        if stats:
-            self.stats = max(stats, key=lambda s: s["gamesPlayed"])
+        for (batch, stats_group, stats_year), game_logs in batches.items()
+    }
+
+
+def plan_stats_fetches(
+    players: Iterable[Player], refetch: Collection[tuple[int, str, int]]
+) -> tuple[dict[tuple[int, str, int], Exception], dict[tuple[tuple[int, ...], str, int], bool]]:
+    """Load what prefetch_stats can from the stats store, and batch the players left to fetch.
+
+    Returns the errors of players whose circuit is open, and whether each batch of
+    (mlb_ids, stats_group, stats_year) is fetched from game logs.
+    """
+    errors: dict[tuple[int, str, int], Exception] = {}
+    missing: dict[int, set[tuple[int, str, int]]] = defaultdict(set)
+    refetched: dict[int, set[tuple[int, str, int]]] = defaultdict(set)
+    game_log_keys = set()
+    for player in players:
+        if player.uses_game_logs:
+            game_log_keys.add(player.cache_key)
+        if player.cache_key in refetch:
+            refetched[player.stats_year].add(player.cache_key)
+            continue
+        cached = player.cache_key in PLAYER_STATS_CACHE
+        metrics.count_cache_lookup("player_stats", cached)
+        if not cached:
+            missing[player.stats_year].add(player.cache_key)
+
+    groups: dict[tuple[str, int], set[int]] = defaultdict(set)
+    for stats_year in missing.keys() | refetched.keys():
+        keys = missing[stats_year]
+        stored = get_stats_store(stats_year).get_player_stats(keys, PLAYER_STATS_CACHE.ttl)
+        metrics.CACHE_REQUESTS.inc(len(stored), cache="stats_store", result="hit")
+        metrics.CACHE_REQUESTS.inc(len(keys) - len(stored), cache="stats_store", result="miss")
+        for key, (team, stats, age) in stored.items():
+            PLAYER_STATS_CACHE.set(key, RawStats.from_api(team, stats), age=age)
+        for key in (keys - stored.keys()) | refetched[stats_year]:
+            if STATS_CIRCUIT_BREAKER.allow(key):
+                mlb_id, stats_group, _ = key
+                groups[(stats_group, stats_year)].add(mlb_id)
+            else:
+                errors[key] = CircuitOpenError(f"Circuit open for {key}")
+
+    batches = {}
+    for (stats_group, stats_year), mlb_ids in groups.items():
+        mlb_ids = sorted(mlb_ids)
+        for i in range(0, len(mlb_ids), BULK_STATS_BATCH_SIZE):
+            batch = tuple(mlb_ids[i:i + BULK_STATS_BATCH_SIZE])
+            game_logs = (batch[0], stats_group, stats_year) in game_log_keys
+            batches[(batch, stats_group, stats_year)] = game_logs
+    return errors, batches
+
+
+def record_fetched_stats(
+    results: dict[tuple[tuple[int, ...], str, int], dict[int, RawStats]],
+    batch_errors: dict[tuple[tuple[int, ...], str, int], Exception],
+    errors: dict[tuple[int, str, int], Exception],
+):
+    """Cache and store the fetched stats, and add the errors of the players not fetched."""
+    fetched: dict[int, dict] = defaultdict(dict)
+    for (batch, stats_group, stats_year), batch_results in results.items():
+        for mlb_id in batch:
+            key = (mlb_id, stats_group, stats_year)
+            raw = batch_results.get(mlb_id)
+            if raw is None:
+                STATS_CIRCUIT_BREAKER.record_failure(key)
+                errors[key] = LookupError(f"Player {mlb_id} missing from the API response")
+                continue
+            STATS_CIRCUIT_BREAKER.record_success(key)
+            PLAYER_STATS_CACHE.set(key, raw)
+            fetched[stats_year][key] = raw.team, raw.to_dict()
+    for stats_year, stats in fetched.items():
+        get_stats_store(stats_year).put_player_stats(stats)
+
+    for (batch, stats_group, stats_year), error in batch_errors.items():
+        for mlb_id in batch:
+            key = (mlb_id, stats_group, stats_year)
+            STATS_CIRCUIT_BREAKER.record_failure(key)
+            errors[key] = error
+
+
+def load_last_fetched_stats(players: Iterable[Player]) -> set[tuple[int, str, int]]:
+    """Give players the last stats fetched for them, however old, from the stats store.
+
+    Returns the cache keys of the players whose stats were found.
+    """
+    by_year: dict[int, list[Player]] = defaultdict(list)
+    for player in players:
+        by_year[player.stats_year].append(player)
+    loaded = set()
+    for stats_year, year_players in by_year.items():
+        stored = get_stats_store(stats_year).get_player_stats(
+            [player.cache_key for player in year_players], max_age=0
+        )
+        for player in year_players:
+            if player.cache_key in stored:
+                team, stats, _ = stored[player.cache_key]
+                player.raw = RawStats.from_api(team, stats)
+                loaded.add(player.cache_key)
+    return loaded
+
+
+def load_stats_fetched_since(
+    since: dict[tuple[int, str, int], float]
+) -> set[tuple[int, str, int]]:
+    """Cache the stored stats of players fetched after the given times, e.g. by another process.
+
+    Returns the cache keys of those players.
+    """
+    by_year: dict[int, list[tuple[int, str, int]]] = defaultdict(list)
+    for key in since:
+        by_year[key[2]].append(key)
+    now = time.time()
+    loaded = set()
+    for stats_year, keys in by_year.items():
+        stored = get_stats_store(stats_year).get_player_stats(keys, max_age=0)
+        for key, (team, stats, age) in stored.items():
+            if now - age > since[key]:
+                PLAYER_STATS_CACHE.set(key, RawStats.from_api(team, stats), age=age)
+                loaded.add(key)
+    return loaded
+
+
+def fetch_stats(
+    players: list[Player], refetch: Collection[tuple[int, str, int]] = ()
+) -> dict[tuple[int, str, int], Exception]:
+    """Fetch stats for all the given players, bypassing caches for those in ``refetch``.
+
+    Returns the error for each player whose stats could not be fetched, by cache
+    key. Those players keep the last stats fetched for them, from the stats store,
+    and are marked as stale until their stats are fetched again.
+    """
+    return apply_fetched_stats(players, prefetch_stats(players, refetch))
+
+
+async def fetch_stats_async(
+    players: list[Player],
+    client: "AsyncStatsClient",
+    refetch: Collection[tuple[int, str, int]] = (),
+) -> dict[tuple[int, str, int], Exception]:
+    """Async counterpart of fetch_stats."""
+    errors = await prefetch_stats_async(players, client, refetch)
+    return await asyncio.to_thread(apply_fetched_stats, players, errors)
+
+
+def apply_fetched_stats(
+    players: list[Player], errors: dict[tuple[int, str, int], Exception]
+) -> dict[tuple[int, str, int], Exception]:
+    """Give players their prefetched stats, or their last ones if they could not be fetched."""
+    for player in players:
+        if player.cache_key in errors:
+            continue
+        try:
+            player.fetch_stats()
+        except Exception as e:
+            errors[player.cache_key] = e
+
+    failed = [player for player in players if player.cache_key in errors]
+    load_last_fetched_stats(failed)
+    for player in players:
+        player.stale = player.cache_key in errors
+
+    skipped = 0
+    for player in failed:
+        error = errors[player.cache_key]
+        if isinstance(error, CircuitOpenError):
+            skipped += 1
+        else:
+            logging.warning(f"Failed to fetch stats for {player}: {error!r}")
+    if skipped:
+        logging.warning(f"Skipped fetching stats for {skipped} players with open circuits")
+    return errors
 
 
 class Hitter(Player):
+    __slots__ = ()
     stats_group = "hitting"
 
     def __init__(
@@ -287,10 +996,11 @@ class Hitter(Player):
         position: Position,
         season: Season,
         stats_year: int,
-        multiplier: float = 1,
+        injury_move: bool = False,
+        minors_penalty: bool = False,
     ):
         assert isinstance(mlb_id, int)
-        
+
         if position == Position.PITCHER:
             raise ValueError("Pitchers cannot be position players!")
 
@@ -300,68 +1010,22 @@ class Hitter(Player):
             position=position,
             season=season,
             stats_year=stats_year,
-            multiplier=multiplier,
+            injury_move=injury_move,
+            minors_penalty=minors_penalty,
         )
 
     @classmethod
     def from_dict(cls, data: dict[str, str], season: Season) -> "Hitter":
-
-        stats_year = season.year
-        multiplier = 1.0
-        if data.get("injury_move"):
-            stats_year = season.last_year
-            multiplier = 0.7 * season.progress
-        if data.get("minors_penalty"):
-            multiplier *= 0.9
-
+        injury_move = bool(data.get("injury_move"))
         return cls(
             mlb_id=data["mlb_id"],
             position=Position(data["pos"]),
             season=season,
-            stats_year=stats_year,
-            multiplier=multiplier,
+            stats_year=season.last_year if injury_move else season.year,
+            injury_move=injury_move,
+            minors_penalty=bool(data.get("minors_penalty")),
         )
 
-    @property
-    def ab(self) -> float:
-        return self.stats.get("atBats", 0)
-
-    @property
-    def runs(self) -> float:
-        return self.stats.get("runs", 0)
-
-    @property
-    def hits(self) -> float:
-        return self.stats.get("hits", 0)
-
-    @property
-    def hr(self) -> float:
-        return self.stats.get("homeRuns", 0)
-
-    @property
-    def rbi(self) -> float:
-        return self.stats.get("rbi", 0)
-
-    @property
-    def sb(self) -> float:
-        return self.stats.get("stolenBases", 0)
-
-    @property
-    def avg(self) -> float:
-        return self.hits / self.ab if self.ab else 0.0
-
-    @property
-    def formatted_avg(self):
-        return format_batting_average(self.avg)
-
-    def fetch_stats(self):
-        super().fetch_stats()
-        if self.multiplier != 1:
-            for key in ["atBats", "runs", "hits", "homeRuns", "rbi", "stolenBases"]:
-                if key not in self.stats:
-                    continue
-                self.stats[key] = self.multiplier * self.stats[key]
-
 
 def format_batting_average(average: float) -> str:
     return f"{average:.3f}"
@@ -372,19 +1036,9 @@ class HitterList(List[Hitter]):
         super().__init__(*args)
         self.role = role
 
-    def get_summary_stats(self, label="Total"):
-        stats = SimpleNamespace(ab=0, runs=0, hits=0, hr=0, rbi=0, sb=0)
-        for hitter in self:
-            for attr in vars(stats):
-                setattr(stats, attr, getattr(stats, attr) + getattr(hitter, attr))
-        stats.avg = stats.hits / stats.ab if stats.ab else 0.0
-        stats.formatted_avg = format_batting_average(stats.avg)
-        if label:
-            stats.name = label
-        return stats
-
 
 class Pitcher(Player):
+    __slots__ = ()
     stats_group = "pitching"
 
     def __init__(
@@ -392,7 +1046,7 @@ class Pitcher(Player):
         mlb_id: int,
         season: Season,
         stats_year: int,
-        multiplier: float = 1.0,
+        injury_move: bool = False,
     ):
 
         super().__init__(
@@ -401,83 +1055,19 @@ class Pitcher(Player):
             position=Position.PITCHER,
             season=season,
             stats_year=stats_year,
-            multiplier=multiplier,
+            injury_move=injury_move,
         )
-    
+
     @classmethod
     def from_dict(cls, data: dict[str, str], season: Season) -> "Pitcher":
-        
-        stats_year = season.year
-        multiplier = 1.0
-        if data.get("injury_move"):
-            stats_year = season.last_year
-            multiplier = 0.7 * season.progress
-
+        injury_move = bool(data.get("injury_move"))
         return cls(
             mlb_id=data["mlb_id"],
             season=season,
-            stats_year=stats_year,
-            multiplier=multiplier,
+            stats_year=season.last_year if injury_move else season.year,
+            injury_move=injury_move,
         )
 
-    @property
-    def ip(self) -> float:
-        return self.stats.get("outs", 0) / 3
-
-    @property
-    def formatted_ip(self) -> str:
-        return format_innings_pitched(self.ip)
-
-    @property
-    def er(self) -> float:
-        return self.stats.get("earnedRuns", 0)
-
-    @property
-    def wins(self) -> float:
-        return self.stats.get("wins", 0)
-
-    @property
-    def saves(self) -> float:
-        return self.stats.get("saves", 0)
-
-    @property
-    def strikeouts(self) -> float:
-        return self.stats.get("strikeOuts", 0)
-
-    @property
-    def walks(self) -> float:
-        return self.stats.get("baseOnBalls", 0)
-
-    @property
-    def earned_run_average(self) -> float:
-        if not self.ip:
-            return 0.0
-        return 9 * self.er / self.ip
-
-    @property
-    def formatted_era(self) -> str:
-        return format_era(self.earned_run_average)
-
-    def fetch_stats(self):
-        super().fetch_stats()
-        season, stats = self.season, self.stats
-        if self.stats_year != season.year:
-            rules = season.rules
-            ip_multiplier = rules.injured_pitcher_innings_multiplier
-            er_multiplier = rules.injured_pitcher_era_multiplier
-            stats["outs"] = stats.get("outs", 0) * ip_multiplier * season.progress
-
-            minimum_era = rules.injured_pitcher_minimum_era
-            minimum_earned_runs = minimum_era * stats["outs"] / 3 / 9
-            earned_runs = stats.get("earnedRuns", 0) * ip_multiplier * er_multiplier * season.progress
-            stats["earnedRuns"] = max(earned_runs, minimum_earned_runs)
-
-        if self.multiplier != 1:
-            for key in ["wins", "saves", "strikeOuts", "baseOnBalls"]:
-                if key not in stats:
-                    continue
-                stats[key] = self.multiplier * stats[key]
-
 
 def format_innings_pitched(innings_pitched: float) -> str:
     return f"{innings_pitched:.2f}"
@@ -488,37 +1078,4 @@ def format_era(earned_run_average: float) -> str:
 
 
 class PitcherList(List[Pitcher]):
-    def get_summary_stats(self, label="Total"):
-        stats = SimpleNamespace(ip=0.0, er=0, wins=0, saves=0, strikeouts=0, walks=0)
-        for pitcher in self:
-            for attr in vars(stats):
-                setattr(stats, attr, getattr(stats, attr) + getattr(pitcher, attr))
-        stats.formatted_ip = format_innings_pitched(stats.ip)
-        stats.era = 9 * stats.er / stats.ip if stats.ip else 0.0
-        stats.formatted_era = format_era(stats.era)
-        stats.name = label
-        return stats
-
-
-if __name__ == "__main__":
-    rules = Rules(
-        num_reserve_hitters=4,
-        num_pitchers=7,
-        team_innings_threshold=900,
-        innings_deficit_multiplier=1/3,
-        innings_surplus_multiplier=0,
-        injured_pitcher_innings_multiplier=0.8,
-        injured_pitcher_era_multiplier=1.3,
-    )
-    szn = Season(year=2024, managers=["Andrew"], rules=rules)
-    andrew = Team("Andrew", szn)
-
-    pitcher = Pitcher("Shane Bieber", szn)
-    pitcher.fetch_stats()
-    print(pitcher.stats)
-
-    hitter = Hitter("Aaron Judge", Position.OUTFIELD, szn)
-    hitter.fetch_stats()
-    print(hitter.stats)
-    print(HitterList([hitter], role=Role.STARTER).get_summary_stats())
-
+    pass
@@ -1,13 +1,40 @@
-import pandas as pd
+import csv
+import json
+import logging
 
 path = "data/2026/2026_SFBB_Player_ID_Map.csv"
-PLAYER_ID_MAP = pd.read_csv(path)
+# Compact MLBID -> name mapping compiled from the SFBB list by running this module.
+compiled_path = "data/2026/mlbid_to_name.json"
 
-MLBID_TO_NAME: dict[int, str] = {
-    row.MLBID: row.MLBNAME for row in PLAYER_ID_MAP.itertuples()
-}
+
+def read_id_map(csv_path: str) -> dict[int, str]:
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        return {
+            int(row["MLBID"]): row["MLBNAME"]
+            for row in csv.DictReader(f)
+            if row["MLBID"]
+        }
+
+
+def load_id_map() -> dict[int, str]:
+    try:
+        with open(compiled_path, "r", encoding="utf-8") as f:
+            return {int(mlb_id): name for mlb_id, name in json.load(f).items()}
+    except FileNotFoundError:
+        logging.warning(f"Compiled player ID map not found, reading {path}")
+        return read_id_map(path)
+
+
+MLBID_TO_NAME: dict[int, str] = load_id_map()
 
 # Fix-up some players missing from the SFBB list.
 MLBID_TO_NAME.update({
     681343: "Shane Smith",
 })
+
+
+if __name__ == "__main__":
+    id_map = read_id_map(path)
+    with open(compiled_path, "w", encoding="utf-8") as f:
+        json.dump(id_map, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    print(f"Wrote {len(id_map)} players to {compiled_path}")
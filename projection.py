@@ -0,0 +1,228 @@
+"""Monte Carlo projection of the end-of-season standings.
+
+The rest of the season is simulated many times from each player's rate stats so
+far. A player's remaining counting stats are drawn from Poisson distributions,
+whose means extrapolate their stats to the games left in the season, and their
+remaining hits from a binomial over the drawn at bats, at their batting average.
+Players counted with prior year stats after an injury move keep their stats.
+Each simulated season is rated with the formulas of :mod:`ratings` at the end of
+the season, and a manager's win probability is the share of simulations in which
+they finish first.
+
+Simulations run in chunks, spread over a small process pool, on a background
+thread: :class:`Projector` projects each new snapshot of the standings, and pages
+show the probabilities of their snapshot once they are ready. Every web worker
+has a projector, but only one of them projects each snapshot, and the others read
+its probabilities from the shared stats store.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+
+import metrics
+from models import Rules, Season
+from ratings import (
+    HITTER_LIST_WEIGHTS,
+    HITTER_LISTS,
+    HITTING_STATS,
+    PITCHER_LIST_WEIGHTS,
+    PITCHER_LISTS,
+    PITCHING_STATS,
+    PlayerColumns,
+    adjust_hitting,
+    adjust_pitching,
+    innings_bonus_or_penalty,
+    offense,
+    pitching,
+    safe_divide,
+    team_totals,
+)
+from stats_store import get_stats_store
+
+# Number of simulations run by each task of the process pool.
+CHUNK_SIZE = 2500
+
+# How long other processes wait for the process projecting a snapshot, in seconds,
+# before projecting it themselves.
+CLAIM_TIMEOUT = 600
+
+
+@dataclass(frozen=True)
+class ProjectionInputs:
+    """Everything the simulations need, as arrays that can be sent to other processes."""
+
+    # Raw stats so far, with multipliers as of the end of the season.
+    hitters: PlayerColumns
+    pitchers: PlayerColumns
+    rules: Rules
+    num_teams: int
+    # Ratio of the games left in the season to the games played so far.
+    remaining_ratio: float
+
+    @classmethod
+    def from_season(cls, season: Season, avg_games_played: float) -> "ProjectionInputs":
+        teams = list(season.teams.values())
+        return cls(
+            hitters=PlayerColumns.from_teams(teams, HITTER_LISTS, HITTING_STATS, 1.0),
+            pitchers=PlayerColumns.from_teams(teams, PITCHER_LISTS, PITCHING_STATS, 1.0),
+            rules=season.rules,
+            num_teams=len(teams),
+            remaining_ratio=max(162 - avg_games_played, 0) / avg_games_played,
+        )
+
+
+def draw_final_stats(
+    players: PlayerColumns,
+    remaining_ratio: float,
+    rng: np.random.Generator,
+    num_simulations: int,
+) -> dict[str, np.ndarray]:
+    """Each player's stats at the end of each simulated season, with shape (sims, players)."""
+    shape = (num_simulations, len(players.team))
+    stats = {}
+    for name, values in players.stats.items():
+        if name == "hits":
+            continue
+        expected = np.where(players.injured, 0.0, values * remaining_ratio)
+        stats[name] = values + rng.poisson(expected, size=shape)
+    if "hits" in players.stats:
+        at_bats = (stats["ab"] - players.stats["ab"]).astype(np.int64)
+        avg = safe_divide(players.stats["hits"], players.stats["ab"])
+        stats["hits"] = players.stats["hits"] + rng.binomial(at_bats, avg)
+    return stats
+
+
+def simulate_wins(inputs: ProjectionInputs, num_simulations: int, seed: int) -> np.ndarray:
+    """Simulate the rest of the season, and count how many times each team finishes first."""
+    rng = np.random.default_rng(seed)
+    ratio, rules, num_teams = inputs.remaining_ratio, inputs.rules, inputs.num_teams
+
+    hitters = replace(
+        inputs.hitters, stats=draw_final_stats(inputs.hitters, ratio, rng, num_simulations)
+    )
+    hitting = team_totals(
+        hitters, adjust_hitting(hitters), HITTER_LIST_WEIGHTS[hitters.list], num_teams
+    )
+    pitchers = replace(
+        inputs.pitchers, stats=draw_final_stats(inputs.pitchers, ratio, rng, num_simulations)
+    )
+    rotation = team_totals(
+        pitchers,
+        adjust_pitching(pitchers, rules, 1.0),
+        PITCHER_LIST_WEIGHTS[pitchers.list],
+        num_teams,
+    )
+
+    ratings = (
+        offense(hitting, 1.0)
+        + pitching(rotation, 162)
+        + innings_bonus_or_penalty(rotation, rules, 1.0)
+    )
+    return np.bincount(ratings.argmax(axis=1), minlength=num_teams)
+
+
+def project(
+    inputs: ProjectionInputs,
+    num_simulations: int,
+    seed: int = 0,
+    executor: Executor | None = None,
+) -> np.ndarray:
+    """Each team's probability of finishing first, in chunks run by the executor if given."""
+    sizes = [CHUNK_SIZE] * (num_simulations // CHUNK_SIZE)
+    if num_simulations % CHUNK_SIZE:
+        sizes.append(num_simulations % CHUNK_SIZE)
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(sizes))]
+    run = executor.map if executor is not None else map
+    wins = sum(run(simulate_wins, [inputs] * len(sizes), sizes, seeds))
+    return wins / num_simulations
+
+
+class Projector:
+    """Projects the win probabilities of successive snapshots on a background thread.
+
+    Submitting a snapshot never waits for its projection. Projections of
+    snapshots superseded before they start are skipped, and the probabilities
+    of the few latest snapshots are kept by version.
+
+    Probabilities are shared by version in the season's stats store. The first
+    process to claim a version projects it, and the others poll the store for
+    its probabilities until the claim times out.
+    """
+
+    def __init__(
+        self, num_simulations: int = 20000, max_workers: int = 2, poll_interval: float = 5
+    ):
+        self.num_simulations = num_simulations
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="projector")
+        # Started on first use, with processes spawned rather than forked from
+        # this multi-threaded process.
+        self._processes: ProcessPoolExecutor | None = None
+        self._results: dict[str, dict[str, float]] = {}
+        self._latest: str | None = None
+        self._lock = threading.Lock()
+
+    def get(self, version: str) -> dict[str, float] | None:
+        """Return each manager's win probability for a snapshot, or None if not projected yet."""
+        with self._lock:
+            return self._results.get(version)
+
+    def submit(self, version: str, season: Season, avg_games_played: float):
+        """Project a snapshot of the season from the stats its players have now."""
+        if avg_games_played <= 0:
+            return
+        with self._lock:
+            if version in self._results or version == self._latest:
+                return
+            self._latest = version
+        managers = [team.manager for team in season.teams.values()]
+        inputs = ProjectionInputs.from_season(season, avg_games_played)
+        self._thread.submit(self._run, version, season.year, managers, inputs)
+
+    def _run(self, version: str, year: int, managers: list[str], inputs: ProjectionInputs):
+        store = get_stats_store(year)
+        name = f"win_probabilities:{version}:{self.num_simulations}"
+        try:
+            while True:
+                with self._lock:
+                    if version != self._latest:
+                        return
+                stored = store.get_value(name, max_age=0)
+                if stored is not None:
+                    self._publish(version, stored[0])
+                    return
+                if store.claim_value(f"{name}:claim", os.getpid(), max_age=CLAIM_TIMEOUT):
+                    break
+                time.sleep(self.poll_interval)
+
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            with metrics.PROJECTION_SECONDS.time():
+                probabilities = project(
+                    inputs, self.num_simulations, int(version, 16), self._processes
+                )
+            result = dict(zip(managers, probabilities.tolist()))
+            store.put_value(name, result)
+        except Exception:
+            logging.exception(f"Failed to project the standings of snapshot {version}")
+            return
+        self._publish(version, result)
+        logging.info(f"Projected snapshot {version} with {self.num_simulations} simulations")
+
+    def _publish(self, version: str, result: dict[str, float]):
+        with self._lock:
+            self._results[version] = result
+            while len(self._results) > 4:
+                del self._results[next(iter(self._results))]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from game_schedule import RefreshScheduler
+from models import Season
+from projection import Projector
+from snapshots import IncrementalSnapshotBuilder, SeasonSnapshot
+
+
+class StandingsRefresher:
+    """Periodically recomputes a season's standings on a background thread.
+
+    Each refresh fetches every player's stats and publishes a new, immutable
+    :class:`SeasonSnapshot`, in which only the teams whose players' stats changed
+    are re-rated. Readers only ever see the latest published snapshot, so serving
+    a page never waits on the MLB Stats API.
+
+    With a :class:`RefreshScheduler`, each refresh only fetches the stats of
+    players whose clubs played since the previous one. With a :class:`Projector`,
+    the win probabilities of each new snapshot are projected in the background.
+
+    :attr:`refreshed_at` is when the last refresh succeeded. It is tracked apart
+    from the snapshot, which is kept as is while the standings do not change.
+
+    The thread is started lazily on the first call to :meth:`get_latest`, so
+    that it runs in each (forked) web worker rather than in the parent process.
+    """
+
+    def __init__(
+        self,
+        season: Season,
+        interval: float = 300,
+        scheduler: RefreshScheduler | None = None,
+        projector: Projector | None = None,
+    ):
+        self.season = season
+        self.interval = interval
+        self.scheduler = scheduler
+        self.projector = projector
+        self._builder = IncrementalSnapshotBuilder(season)
+        self._snapshot: SeasonSnapshot | None = None
+        self.refreshed_at: float | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def get_latest(self) -> SeasonSnapshot | None:
+        """Return the most recently published snapshot, or None before the first one."""
+        self.start()
+        return self._snapshot
+
+    def refresh(self) -> SeasonSnapshot:
+        if self.scheduler is None:
+            self.season.fetch_all_stats()
+        else:
+            self.scheduler.fetch_due_stats()
+        snapshot = self._builder.build()
+        previous = self._snapshot
+        if previous is not None and snapshot.version == previous.version:
+            # Keep the standings' creation time, so pages and validators stay the same.
+            snapshot = previous
+        self._snapshot = snapshot
+        if self.projector is not None and snapshot is not previous:
+            self.projector.submit(snapshot.version, self.season, snapshot.avg_games_played)
+        self.refreshed_at = time.time()
+        logging.info(f"Refreshed {self.season.year} standings")
+        return snapshot
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"standings-refresher-{self.season.year}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._stopped.set()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logging.exception(f"Failed to refresh {self.season.year} standings")
+            self._stopped.wait(self.interval)
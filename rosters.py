@@ -0,0 +1,179 @@
+"""Validation and compilation of the YAML team rosters.
+
+``flask compile-rosters`` validates every roster of a season and writes them to
+a single compact JSON index, ``data/<year>/rosters.json``, mapping each manager
+to their lists of players (mlb_id, pos and any flags). Teams are loaded from the
+index at runtime. The index records a digest of each YAML file it was compiled
+from, and a roster that changed since is parsed and validated from its YAML
+file instead.
+"""
+from __future__ import annotations
+
+from collections import Counter
+import hashlib
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+from constants import Position
+from player_id_map import MLBID_TO_NAME
+from utils.files import write_atomic
+
+if TYPE_CHECKING:
+    from models import Season
+
+ROSTER_LISTS = ("starters", "bench", "rotation", "minors")
+PLAYER_FLAGS = ("injury_move", "minors_penalty")
+
+STARTER_POSITION_COUNTS = {
+    Position.FIRST_BASE: 1,
+    Position.SECOND_BASE: 1,
+    Position.SHORTSTOP: 1,
+    Position.THIRD_BASE: 1,
+    Position.CATCHER: 1,
+    Position.OUTFIELD: 3,
+    Position.DESIGNATED_HITTER: 1,
+}
+MAX_MINORS = 5
+
+
+class RosterError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def roster_path(season: "Season", manager: str) -> str:
+    return f"data/{season.year}/teams/{manager.lower()}.yaml"
+
+
+def index_path(season: "Season") -> str:
+    return f"data/{season.year}/rosters.json"
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def validate_player(player: Any, list_name: str, index: int) -> list[str]:
+    where = f"{list_name}[{index}]"
+    if not isinstance(player, dict):
+        return [f"{where}: expected a mapping, not {player!r}"]
+    errors = []
+    mlb_id = player.get("mlb_id")
+    if not isinstance(mlb_id, int):
+        errors.append(f"{where}: mlb_id must be an integer, not {mlb_id!r}")
+    elif mlb_id not in MLBID_TO_NAME:
+        errors.append(f"{where}: unknown mlb_id {mlb_id} ({player.get('name', 'no name')})")
+    try:
+        position = Position(player.get("pos"))
+    except ValueError:
+        errors.append(f"{where}: unknown position {player.get('pos')!r}")
+    else:
+        if position == Position.PITCHER and list_name in ("starters", "bench"):
+            errors.append(f"{where}: pitchers cannot be position players")
+    return errors
+
+
+def validate_roster(data: Any, season: "Season") -> list[str]:
+    """Return every problem with a roster, rather than stopping at the first one."""
+    if not isinstance(data, dict):
+        return ["expected a mapping of lists"]
+    errors = [f"missing list: {name}" for name in ROSTER_LISTS if name not in data]
+    lists = {name: data.get(name) or [] for name in ROSTER_LISTS}
+    for name, players in lists.items():
+        for i, player in enumerate(players):
+            errors.extend(validate_player(player, name, i))
+
+    starters, rules = lists["starters"], season.rules
+    if len(starters) != 9:
+        errors.append(f"expected 9 starters, not {len(starters)}")
+    position_counts = Counter(
+        player.get("pos") for player in starters if isinstance(player, dict)
+    )
+    expected_counts = {position.value: count for position, count in STARTER_POSITION_COUNTS.items()}
+    if position_counts != expected_counts:
+        errors.append(f"starter position counts {dict(position_counts)} != {expected_counts}")
+    if len(lists["bench"]) != rules.num_reserve_hitters:
+        errors.append(
+            f"expected {rules.num_reserve_hitters} bench hitters, not {len(lists['bench'])}"
+        )
+    if len(lists["rotation"]) != rules.num_pitchers:
+        errors.append(f"expected {rules.num_pitchers} pitchers, not {len(lists['rotation'])}")
+    if len(lists["minors"]) > MAX_MINORS:
+        errors.append(
+            f"expected at most {MAX_MINORS} players in minors, not {len(lists['minors'])}"
+        )
+    return errors
+
+
+def compact_player(player: dict[str, Any]) -> dict[str, Any]:
+    compact = {"mlb_id": player["mlb_id"], "pos": player["pos"]}
+    compact.update({flag: True for flag in PLAYER_FLAGS if player.get(flag)})
+    return compact
+
+
+def compile_roster(season: "Season", manager: str) -> dict[str, list[dict[str, Any]]]:
+    """Parse and validate a team's YAML roster, raising a RosterError listing every problem."""
+    path = roster_path(season, manager)
+    with open(path, "r") as f:
+        try:
+            data = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise RosterError([f"{path}: {e}"])
+    errors = validate_roster(data, season)
+    if errors:
+        raise RosterError([f"{path}: {error}" for error in errors])
+    return {name: [compact_player(player) for player in data[name]] for name in ROSTER_LISTS}
+
+
+def compile_rosters(season: "Season") -> tuple[dict[str, Any], list[str]]:
+    """Compile every roster of a season. Returns the index and the errors of all rosters."""
+    teams, digests, errors = {}, {}, []
+    for manager in season.managers:
+        path = roster_path(season, manager)
+        try:
+            teams[manager.lower()] = compile_roster(season, manager)
+            digests[manager.lower()] = file_digest(path)
+        except FileNotFoundError:
+            errors.append(f"{path}: file not found")
+        except RosterError as e:
+            errors.extend(e.errors)
+    return {"year": season.year, "digests": digests, "teams": teams}, errors
+
+
+def write_roster_index(season: "Season", index: dict[str, Any]):
+    write_atomic(index_path(season), json.dumps(index, separators=(",", ":"), sort_keys=True))
+
+
+# Roster indexes, loaded from disk at most once per process.
+_indexes: dict[int, dict[str, Any] | None] = {}
+_indexes_lock = threading.Lock()
+
+
+def load_roster_index(season: "Season") -> dict[str, Any] | None:
+    with _indexes_lock:
+        if season.year not in _indexes:
+            try:
+                with open(index_path(season), "r") as f:
+                    _indexes[season.year] = json.load(f)
+            except FileNotFoundError:
+                logging.warning(f"No roster index found for {season.year}, parsing YAML rosters")
+                _indexes[season.year] = None
+        return _indexes[season.year]
+
+
+def load_roster(season: "Season", manager: str) -> dict[str, list[dict[str, Any]]]:
+    """Return a team's compiled roster, from the season's index if it is up to date."""
+    index = load_roster_index(season)
+    manager = manager.lower()
+    if index is not None and manager in index["teams"]:
+        path = roster_path(season, manager)
+        if index["digests"].get(manager) == file_digest(path):
+            return index["teams"][manager]
+        logging.warning(f"{path} changed since the roster index was compiled")
+    return compile_roster(season, manager)
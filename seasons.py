@@ -22,6 +22,7 @@ seasons: list[Season] = [
     ),
     Season(
         year=2025,
+        completed=True,
         # fmt: off
         managers=["Andrew", "Justin", "Ron", "Myron", "Paula", "Scott", "John", "Evans", "Jeff", "Rich"],
         # fmt: on
@@ -37,6 +38,7 @@ seasons: list[Season] = [
     ),
     Season(
         year=2024,
+        completed=True,
         # fmt: off
         managers=["Andrew", "Justin", "Rich", "Jeff", "Scott", "Evans", "Myron", "John", "Paula", "Ron"],
         # fmt: on
@@ -52,6 +54,7 @@ seasons: list[Season] = [
     ),
     Season(
         year=2023,
+        completed=True,
         # fmt: off
         managers=["Andrew", "Evans", "Jeff", "John", "Justin", "Myron", "Paula", "Rich", "Ron", "Scott"],
         # fmt: on
@@ -69,6 +72,7 @@ seasons: list[Season] = [
     ),
     Season(
         year=2022,
+        completed=True,
         # fmt: off
         managers=["Andrew", "Evans", "Jeff", "John", "Myron", "Paula", "Rich", "Scott", "Ron", "Justin"],
         # fmt: on
@@ -84,6 +88,7 @@ seasons: list[Season] = [
     ),
     Season(
         year=2021,
+        completed=True,
         managers=["Andrew", "Evans", "Jeff", "John", "Myron", "Paula", "Rich", "Scott"],
         rules=Rules(
             num_reserve_hitters=5,
@@ -0,0 +1,520 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date
+from functools import cached_property
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from models import (
+    Hitter,
+    HitterList,
+    Pitcher,
+    PitcherList,
+    Season,
+    Team,
+    format_batting_average,
+    format_era,
+    format_innings_pitched,
+    load_game_log_totals,
+)
+from ratings import HITTER_LISTS, PITCHER_LISTS, SeasonRatings, rate_teams
+from utils.files import write_atomic
+from utils.ttl_cache import TTLCache
+
+
+def as_number(value: float) -> int | float:
+    """Convert a computed stat to a plain int if it is whole, otherwise to a float."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+@dataclass(frozen=True)
+class HitterLine:
+    name: str
+    ab: float = 0
+    runs: float = 0
+    hits: float = 0
+    hr: float = 0
+    rbi: float = 0
+    sb: float = 0
+    team: str = ""
+    position: str = ""
+    notes: str = ""
+    mlb_id: int | None = None
+    # Whether the stats could not be refreshed, and are the last ones fetched.
+    stale: bool = False
+
+    @classmethod
+    def from_hitter(
+        cls, hitter: Hitter, stats: dict[str, float], multiplier: float
+    ) -> "HitterLine":
+        return cls(
+            name=hitter.name,
+            **{name: as_number(value) for name, value in stats.items()},
+            team=hitter.team,
+            position=str(hitter.position),
+            notes=hitter.notes_with(multiplier),
+            mlb_id=hitter.mlb_id,
+            stale=hitter.stale,
+        )
+
+    @property
+    def avg(self) -> float:
+        return self.hits / self.ab if self.ab else 0.0
+
+    @property
+    def formatted_avg(self) -> str:
+        return format_batting_average(self.avg)
+
+    @property
+    def mlb_profile_url(self) -> str | None:
+        if self.mlb_id is None:
+            return None
+        return f"https://www.mlb.com/player/{self.mlb_id}"
+
+
+@dataclass(frozen=True)
+class PitcherLine:
+    name: str
+    ip: float = 0.0
+    er: float = 0
+    wins: float = 0
+    saves: float = 0
+    strikeouts: float = 0
+    walks: float = 0
+    team: str = ""
+    position: str = ""
+    notes: str = ""
+    mlb_id: int | None = None
+    # Whether the stats could not be refreshed, and are the last ones fetched.
+    stale: bool = False
+
+    @classmethod
+    def from_stats(cls, name: str, stats: dict[str, float], **kwargs) -> "PitcherLine":
+        stats = dict(stats)
+        stats["ip"] = stats.pop("outs") / 3
+        return cls(name=name, **{k: as_number(v) for k, v in stats.items()}, **kwargs)
+
+    @classmethod
+    def from_pitcher(
+        cls, pitcher: Pitcher, stats: dict[str, float], multiplier: float
+    ) -> "PitcherLine":
+        return cls.from_stats(
+            pitcher.name,
+            stats,
+            team=pitcher.team,
+            position=str(pitcher.position),
+            notes=pitcher.notes_with(multiplier),
+            mlb_id=pitcher.mlb_id,
+            stale=pitcher.stale,
+        )
+
+    @property
+    def formatted_ip(self) -> str:
+        return format_innings_pitched(self.ip)
+
+    @property
+    def era(self) -> float:
+        return 9 * self.er / self.ip if self.ip else 0.0
+
+    @property
+    def formatted_era(self) -> str:
+        return format_era(self.era)
+
+    @property
+    def mlb_profile_url(self) -> str | None:
+        if self.mlb_id is None:
+            return None
+        return f"https://www.mlb.com/player/{self.mlb_id}"
+
+
+@dataclass(frozen=True)
+class HitterTable:
+    rows: tuple[HitterLine, ...]
+    total: HitterLine
+
+    @classmethod
+    def from_ratings(
+        cls, hitters: HitterList, ratings: SeasonRatings, team_index: int, list_name: str
+    ) -> "HitterTable":
+        stats = ratings.hitting_stats
+        rows = ratings.hitter_rows(team_index, list_name)
+        subtotals = ratings.hitting_subtotals
+        list_index = HITTER_LISTS.index(list_name)
+        return cls(
+            rows=tuple(
+                HitterLine.from_hitter(
+                    hitter,
+                    {name: stats[name][row] for name in stats},
+                    ratings.hitters.multiplier[row],
+                )
+                for hitter, row in zip(hitters, rows)
+            ),
+            total=HitterLine(
+                name="Total",
+                **{name: as_number(subtotals[name][team_index, list_index]) for name in stats},
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "HitterTable":
+        return cls(
+            rows=tuple(HitterLine(**row) for row in data["rows"]),
+            total=HitterLine(**data["total"]),
+        )
+
+    @property
+    def lines(self) -> tuple[HitterLine, ...]:
+        return self.rows + (self.total,)
+
+
+@dataclass(frozen=True)
+class PitcherTable:
+    rows: tuple[PitcherLine, ...]
+    total: PitcherLine
+
+    @classmethod
+    def from_ratings(
+        cls, pitchers: PitcherList, ratings: SeasonRatings, team_index: int, list_name: str
+    ) -> "PitcherTable":
+        stats = ratings.pitching_stats
+        rows = ratings.pitcher_rows(team_index, list_name)
+        subtotals = ratings.pitching_subtotals
+        list_index = PITCHER_LISTS.index(list_name)
+        return cls(
+            rows=tuple(
+                PitcherLine.from_pitcher(
+                    pitcher,
+                    {name: stats[name][row] for name in stats},
+                    ratings.pitchers.multiplier[row],
+                )
+                for pitcher, row in zip(pitchers, rows)
+            ),
+            total=PitcherLine.from_stats(
+                "Total", {name: subtotals[name][team_index, list_index] for name in stats}
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PitcherTable":
+        return cls(
+            rows=tuple(PitcherLine(**row) for row in data["rows"]),
+            total=PitcherLine(**data["total"]),
+        )
+
+    @property
+    def lines(self) -> tuple[PitcherLine, ...]:
+        return self.rows + (self.total,)
+
+
+@dataclass(frozen=True)
+class TeamSnapshot:
+    manager: str
+    offense: float
+    pitching: float
+    innings_bonus_or_penalty: float
+    rating: float
+    starters: HitterTable
+    bench: HitterTable
+    minors_hitters: HitterTable
+    rotation: PitcherTable
+    minors_pitchers: PitcherTable
+
+    @classmethod
+    def from_ratings(
+        cls,
+        team: Team,
+        ratings: SeasonRatings,
+        index: int,
+        unchanged: dict[str, HitterTable | PitcherTable] | None = None,
+    ) -> "TeamSnapshot":
+        """Build a team's snapshot, reusing the given tables of lists that have not changed."""
+        tables = dict(unchanged or {})
+        for name in HITTER_LISTS:
+            if name not in tables:
+                tables[name] = HitterTable.from_ratings(getattr(team, name), ratings, index, name)
+        for name in PITCHER_LISTS:
+            if name not in tables:
+                tables[name] = PitcherTable.from_ratings(getattr(team, name), ratings, index, name)
+        return cls(
+            manager=team.manager,
+            offense=float(ratings.offense[index]),
+            pitching=float(ratings.pitching[index]),
+            innings_bonus_or_penalty=float(ratings.innings_bonus_or_penalty[index]),
+            rating=float(ratings.rating[index]),
+            **tables,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TeamSnapshot":
+        return cls(
+            manager=data["manager"],
+            offense=data["offense"],
+            pitching=data["pitching"],
+            innings_bonus_or_penalty=data["innings_bonus_or_penalty"],
+            rating=data["rating"],
+            starters=HitterTable.from_dict(data["starters"]),
+            bench=HitterTable.from_dict(data["bench"]),
+            minors_hitters=HitterTable.from_dict(data["minors_hitters"]),
+            rotation=PitcherTable.from_dict(data["rotation"]),
+            minors_pitchers=PitcherTable.from_dict(data["minors_pitchers"]),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def rating_dict(self) -> dict[str, Any]:
+        return {
+            "manager": self.manager,
+            "offense": self.offense,
+            "pitching": self.pitching,
+            "innings_bonus_or_penalty": self.innings_bonus_or_penalty,
+            "rating": self.rating,
+        }
+
+
+@dataclass(frozen=True)
+class SeasonSnapshot:
+    """Fully computed standings and team stats for a season at a point in time."""
+
+    year: int
+    rating_precision: int
+    avg_games_played: float
+    # In standings order, i.e. sorted by descending rating.
+    teams: tuple[TeamSnapshot, ...]
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_season(cls, season: Season) -> "SeasonSnapshot":
+        """Fetch all stats for the season and compute its standings."""
+        season.fetch_all_stats()
+        avg_games_played = season.avg_games_played
+        teams = list(season.teams.values())
+        ratings = rate_teams(teams, season.rules, avg_games_played)
+        snapshots = [
+            TeamSnapshot.from_ratings(team, ratings, index) for index, team in enumerate(teams)
+        ]
+        return cls.from_teams(season, avg_games_played, snapshots)
+
+    @classmethod
+    def as_of(cls, season: Season, as_of: date) -> "SeasonSnapshot":
+        """Compute the season's standings from the game logs ingested up to a date."""
+        # A copy of the season has its own rosters, so the live players are untouched.
+        season = replace(season)
+        teams = list(season.teams.values())
+        load_game_log_totals([player for team in teams for player in team.players], as_of)
+        avg_games_played = season.avg_games_played_as_of(as_of)
+        ratings = rate_teams(teams, season.rules, avg_games_played)
+        snapshots = [
+            TeamSnapshot.from_ratings(team, ratings, index) for index, team in enumerate(teams)
+        ]
+        return cls.from_teams(season, avg_games_played, snapshots)
+
+    @classmethod
+    def from_teams(
+        cls, season: Season, avg_games_played: float, teams: list[TeamSnapshot]
+    ) -> "SeasonSnapshot":
+        return cls(
+            year=season.year,
+            rating_precision=season.rating_precision,
+            avg_games_played=avg_games_played,
+            teams=tuple(sorted(teams, key=lambda team: team.rating, reverse=True)),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SeasonSnapshot":
+        return cls(
+            year=data["year"],
+            rating_precision=data["rating_precision"],
+            avg_games_played=data["avg_games_played"],
+            teams=tuple(TeamSnapshot.from_dict(team) for team in data["teams"]),
+            created_at=data["created_at"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def standings_dict(self) -> dict[str, Any]:
+        return {
+            "year": self.year,
+            "avg_games_played": self.avg_games_played,
+            "created_at": self.created_at,
+            "standings": [team.rating_dict() for team in self.teams],
+        }
+
+    def content_dict(self) -> dict[str, Any]:
+        """Everything in the snapshot but when it was created."""
+        return {k: v for k, v in self.to_dict().items() if k != "created_at"}
+
+    @cached_property
+    def version(self) -> str:
+        """Hash identifying the contents of this snapshot, the same for identical standings."""
+        data = json.dumps(self.content_dict(), separators=(",", ":"), sort_keys=True)
+        return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path: str) -> "SeasonSnapshot":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str):
+        write_atomic(path, json.dumps(self.to_dict(), separators=(",", ":")))
+
+    @property
+    def standings(self) -> tuple[TeamSnapshot, ...]:
+        return self.teams
+
+    def team(self, manager: str) -> TeamSnapshot | None:
+        for team in self.teams:
+            if team.manager.lower() == manager.lower():
+                return team
+        return None
+
+
+# Snapshots of completed seasons, loaded from disk at most once per process.
+_FROZEN_SNAPSHOTS: dict[int, SeasonSnapshot] = {}
+
+
+def get_frozen_snapshot(season: Season) -> SeasonSnapshot | None:
+    """Return the on-disk snapshot of a completed season, if it has one."""
+    if not season.completed:
+        return None
+    snapshot = _FROZEN_SNAPSHOTS.get(season.year)
+    if snapshot is None and os.path.exists(season.snapshot_path):
+        snapshot = SeasonSnapshot.load(season.snapshot_path)
+        _FROZEN_SNAPSHOTS[season.year] = snapshot
+    if snapshot is None:
+        logging.warning(f"No snapshot found for completed {season.year} season")
+    return snapshot
+
+
+# Snapshots of completed seasons that could not be frozen, by year. Each is
+# computed by a single caller, and computed again once it expires.
+_UNFROZEN_SNAPSHOTS = TTLCache(
+    ttl=float(os.environ.get("UNFROZEN_SNAPSHOT_TTL", 60)), maxsize=8
+)
+
+
+def is_frozen(season: Season) -> bool:
+    """Whether the season's standings are final, i.e. its snapshot was saved to disk."""
+    return season.year in _FROZEN_SNAPSHOTS
+
+
+def get_snapshot(season: Season) -> SeasonSnapshot:
+    """Return the standings for a season, from its frozen snapshot if it has one.
+
+    A completed season without a frozen snapshot is computed and frozen to disk,
+    once per process. If some of its players' stats could not be fetched, it is
+    not frozen, and is served from _UNFROZEN_SNAPSHOTS until computed again.
+    """
+    snapshot = get_frozen_snapshot(season)
+    if snapshot is not None or not season.completed:
+        return snapshot or SeasonSnapshot.from_season(season)
+    return _UNFROZEN_SNAPSHOTS.get(season.year, lambda: compute_completed_snapshot(season))
+
+
+def compute_completed_snapshot(season: Season) -> SeasonSnapshot:
+    """Compute a completed season's snapshot, and freeze it unless it has stale stats."""
+    snapshot = _FROZEN_SNAPSHOTS.get(season.year)
+    if snapshot is not None:
+        return snapshot
+    snapshot = SeasonSnapshot.from_season(season)
+    if has_stale_stats(season):
+        logging.warning(f"Not freezing the {season.year} season, which has stale stats")
+    else:
+        snapshot.save(season.snapshot_path)
+        _FROZEN_SNAPSHOTS[season.year] = snapshot
+        logging.info(f"Froze {season.year} season to {season.snapshot_path}")
+    return snapshot
+
+
+def list_inputs(team: Team) -> dict[str, tuple]:
+    """Everything each of a team's lists is derived from, besides the season's progress."""
+    return {
+        name: tuple(
+            (player.cache_key, player.injury_move, player.minors_penalty, player.raw, player.stale)
+            for player in getattr(team, name)
+        )
+        for name in HITTER_LISTS + PITCHER_LISTS
+    }
+
+
+class IncrementalSnapshotBuilder:
+    """Builds successive snapshots of a season, recomputing only what has changed.
+
+    Changes are tracked from players to the lists they are on, and from lists to
+    their team: a team is re-rated only if the stats of one of its players changed
+    since the previous snapshot, and only the tables of its changed lists are
+    rebuilt. Other teams are carried over from the previous snapshot, and the
+    standings are re-sorted. A change in the number of games played affects every
+    rating, so it triggers a full rebuild.
+    """
+
+    def __init__(self, season: Season):
+        self.season = season
+        self._snapshot: SeasonSnapshot | None = None
+        self._inputs: dict[str, dict[str, tuple]] = {}
+
+    def build(self) -> SeasonSnapshot:
+        """Build a snapshot from the season's currently fetched stats."""
+        season = self.season
+        avg_games_played = season.avg_games_played
+        previous = self._snapshot
+        if previous is None or previous.avg_games_played != avg_games_played:
+            self._inputs = {}
+
+        inputs = {team.manager: list_inputs(team) for team in season.teams.values()}
+        changed = [
+            team for team in season.teams.values()
+            if inputs[team.manager] != self._inputs.get(team.manager)
+        ]
+        snapshots = {
+            manager: previous.team(manager)
+            for manager in inputs
+            if manager in self._inputs
+        }
+        if changed:
+            ratings = rate_teams(changed, season.rules, avg_games_played)
+            for index, team in enumerate(changed):
+                old_inputs = self._inputs.get(team.manager, {})
+                unchanged = {
+                    name: getattr(snapshots[team.manager], name)
+                    for name, value in inputs[team.manager].items()
+                    if old_inputs.get(name) == value
+                }
+                snapshots[team.manager] = TeamSnapshot.from_ratings(
+                    team, ratings, index, unchanged
+                )
+
+        logging.info(f"Re-rated {len(changed)} of {len(inputs)} {season.year} teams")
+        snapshot = SeasonSnapshot.from_teams(season, avg_games_played, list(snapshots.values()))
+        self._snapshot, self._inputs = snapshot, inputs
+        return snapshot
+
+
+def has_stale_stats(season: Season) -> bool:
+    """Whether some of the season's players' stats could not be fetched."""
+    return any(player.stale for team in season.teams.values() for player in team.players)
+
+
+def freeze(season: Season) -> SeasonSnapshot:
+    """Materialize the season's standings to its on-disk snapshot.
+
+    Raises ValueError, without saving the snapshot, if some of the season's
+    players' stats could not be fetched.
+    """
+    snapshot = SeasonSnapshot.from_season(season)
+    if has_stale_stats(season):
+        raise ValueError(
+            f"Not freezing the {season.year} season, which has stale stats."
+            " Try again once every player's stats can be fetched."
+        )
+    snapshot.save(season.snapshot_path)
+    _FROZEN_SNAPSHOTS[season.year] = snapshot
+    logging.info(f"Froze {season.year} season to {season.snapshot_path}")
+    return snapshot
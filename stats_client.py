@@ -0,0 +1,157 @@
+"""Asynchronous client for the MLB Stats API.
+
+The statsapi functions block their thread for the duration of each call, so
+holding many calls in flight takes as many threads. :class:`AsyncStatsClient`
+makes its calls from a single event loop instead, over one aiohttp session whose
+connection pool keeps connections to the API alive between calls.
+
+Most of the app is synchronous, so each process runs its client on a background
+event loop (see :func:`get_stats_loop`), which synchronous code submits calls to.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import aiohttp
+from statsapi.endpoints import ENDPOINTS
+
+import metrics
+from models import parse_standings_data, standings_params
+
+T = TypeVar("T")
+
+
+class AsyncStatsClient:
+    """MLB Stats API client with a bounded, keep-alive connection pool, timeouts and retries.
+
+    Like :class:`utils.fetch_pool.FetchPool`, every call that fails or takes more
+    than ``timeout`` seconds is retried up to ``retries`` times with exponential
+    backoff starting at ``backoff`` seconds. At most ``max_connections`` calls are
+    in flight at once; the others wait for a free connection.
+
+    The session is created on first use, in the event loop the client is used
+    from, and the client must only be used from that loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        timeout: float = 15,
+        retries: int = 2,
+        backoff: float = 0.5,
+        keepalive_timeout: float = 60,
+        base_url: str | None = None,
+    ):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.keepalive_timeout = keepalive_timeout
+        # Replaces https://statsapi.mlb.com/api/ in endpoint URLs, e.g. for a local stand-in.
+        self.base_url = base_url
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                raise_for_status=True,
+            )
+        return self._session
+
+    def url(self, endpoint: str) -> str:
+        url = ENDPOINTS[endpoint]["url"].replace("{ver}", "v1")
+        if self.base_url is not None:
+            url = url.replace("https://statsapi.mlb.com/api/", self.base_url)
+        return url
+
+    async def get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Async counterpart of ``statsapi.get``, for endpoints without path parameters."""
+        params = {name: str(value) for name, value in params.items()}
+        for attempt in range(self.retries + 1):
+            try:
+                with metrics.statsapi_call(endpoint):
+                    async with self.session.get(self.url(endpoint), params=params) as response:
+                        return await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def standings_data(
+        self, league_id: int, season: int, date: str | None = None
+    ) -> dict[int, dict[str, Any]]:
+        """Each division's teams and their records, as returned by ``statsapi.standings_data``."""
+        data = await self.get("standings", standings_params(league_id, season, date))
+        return parse_standings_data(data)
+
+    async def run_all(
+        self, calls: dict[Hashable, Callable[[], Awaitable[Any]]]
+    ) -> tuple[dict[Hashable, Any], dict[Hashable, Exception]]:
+        """Run every call concurrently, and return results and errors by key like FetchPool."""
+        keys = list(calls)
+        outcomes = await asyncio.gather(*(calls[key]() for key in keys), return_exceptions=True)
+        results, errors = {}, {}
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, Exception):
+                errors[key] = outcome
+            else:
+                results[key] = outcome
+        return results, errors
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class StatsLoop:
+    """An event loop on a background thread, running an AsyncStatsClient for synchronous code."""
+
+    def __init__(self, client: AsyncStatsClient):
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="stats-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, call: Callable[[AsyncStatsClient], Awaitable[T]]) -> T:
+        """Run ``call(client)`` on the loop, and wait for its result."""
+        async def run_call() -> T:
+            return await call(self.client)
+
+        return asyncio.run_coroutine_threadsafe(run_call(), self._loop).result()
+
+    def close(self):
+        """Close the client's connections, and stop the loop."""
+        self.run(lambda client: client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+_stats_loop: StatsLoop | None = None
+_stats_loop_lock = threading.Lock()
+
+
+def get_stats_loop() -> StatsLoop:
+    """Return this process's stats loop, started on first use (so after any fork)."""
+    global _stats_loop
+    with _stats_loop_lock:
+        if _stats_loop is None:
+            _stats_loop = StatsLoop(AsyncStatsClient(
+                max_connections=int(os.environ.get("STATS_MAX_CONNECTIONS", 20)),
+                timeout=float(os.environ.get("FETCH_TIMEOUT", 15)),
+                retries=int(os.environ.get("FETCH_RETRIES", 2)),
+            ))
+            atexit.register(_stats_loop.close)
+        return _stats_loop
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_stats (
+    mlb_id INTEGER NOT NULL,
+    stats_group TEXT NOT NULL,
+    stats_year INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (mlb_id, stats_group, stats_year)
+);
+CREATE TABLE IF NOT EXISTS season_values (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_games (
+    mlb_id INTEGER NOT NULL,
+    stats_group TEXT NOT NULL,
+    stats_year INTEGER NOT NULL,
+    game_pk INTEGER NOT NULL,
+    game_date TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    PRIMARY KEY (mlb_id, stats_group, stats_year, game_pk)
+);
+CREATE TABLE IF NOT EXISTS game_logs (
+    mlb_id INTEGER NOT NULL,
+    stats_group TEXT NOT NULL,
+    stats_year INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    ingested_through TEXT NOT NULL,
+    PRIMARY KEY (mlb_id, stats_group, stats_year)
+);
+CREATE TABLE IF NOT EXISTS final_games (
+    game_id INTEGER PRIMARY KEY,
+    final_at REAL NOT NULL
+);
+"""
+
+PlayerKey = tuple[int, str, int]
+# A game's (game_pk, ISO date, stats).
+Game = tuple[int, str, dict[str, Any]]
+
+# Directory holding one <year>/stats.sqlite3 store per season.
+STATS_STORE_DIR = os.environ.get("STATS_STORE_DIR", "data")
+
+
+class StatsStore:
+    """SQLite-backed store of fetched stats, shared by every worker process.
+
+    Player stats are stored as the (team, stats) payloads returned by the MLB
+    Stats API, together with the time they were fetched. Reads take a
+    ``max_age`` in seconds and ignore older rows; a ``max_age`` of zero never
+    expires. Each thread uses its own connection, and the database runs in WAL
+    mode so that readers never block on the writer.
+
+    Players' game logs are stored one row per game, along with the date up to
+    which each player's games have been ingested, and summed into season totals.
+    The time each game of the schedule was first seen final is also shared.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def get_player_stats(
+        self, keys: Iterable[PlayerKey], max_age: float
+    ) -> dict[PlayerKey, tuple[str, dict[str, Any], float]]:
+        """Return the (team, stats, age) of each of the given players with fresh stats."""
+        now = time.time()
+        results = {}
+        for mlb_id, stats_group, stats_year in keys:
+            row = self.connection.execute(
+                "SELECT team, stats, fetched_at FROM player_stats"
+                " WHERE mlb_id = ? AND stats_group = ? AND stats_year = ?",
+                (mlb_id, stats_group, stats_year),
+            ).fetchone()
+            if row is None:
+                continue
+            team, stats, fetched_at = row
+            if 0 < max_age < now - fetched_at:
+                continue
+            results[(mlb_id, stats_group, stats_year)] = team, json.loads(stats), now - fetched_at
+        return results
+
+    def put_player_stats(self, stats: dict[PlayerKey, tuple[str, dict[str, Any]]]):
+        now = time.time()
+        rows = [
+            (mlb_id, stats_group, stats_year, team, json.dumps(player_stats), now)
+            for (mlb_id, stats_group, stats_year), (team, player_stats) in stats.items()
+        ]
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO player_stats VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def get_ingested_through(self, keys: Iterable[PlayerKey]) -> dict[PlayerKey, str]:
+        """Return the ISO date up to which each player's games have been ingested."""
+        results = {}
+        for key in keys:
+            row = self.connection.execute(
+                "SELECT ingested_through FROM game_logs"
+                " WHERE mlb_id = ? AND stats_group = ? AND stats_year = ?",
+                key,
+            ).fetchone()
+            if row is not None:
+                results[key] = row[0]
+        return results
+
+    def put_games(self, games: dict[PlayerKey, tuple[str, list[Game]]], ingested_through: str):
+        """Add or replace players' games, and record that they are ingested up to a date.
+
+        A player's ingested date never moves back past their last stored game.
+        """
+        game_rows = [
+            (*key, game_pk, game_date, json.dumps(stats))
+            for key, (_, player_games) in games.items()
+            for game_pk, game_date, stats in player_games
+        ]
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO player_games VALUES (?, ?, ?, ?, ?, ?)", game_rows
+            )
+            for key, (team, player_games) in games.items():
+                through = max([ingested_through, *(game[1] for game in player_games)])
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO game_logs VALUES (?, ?, ?, ?, ?)",
+                    (*key, team, through),
+                )
+
+    def get_game_totals(
+        self, keys: Iterable[PlayerKey], as_of: str | None = None
+    ) -> dict[PlayerKey, tuple[str, dict[str, float]]]:
+        """Return the (team, stats) of each ingested player, summed over their games.
+
+        With ``as_of``, only games up to that ISO date are counted.
+        """
+        results = {}
+        for key in keys:
+            row = self.connection.execute(
+                "SELECT team FROM game_logs"
+                " WHERE mlb_id = ? AND stats_group = ? AND stats_year = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                continue
+            games = self.connection.execute(
+                "SELECT stats FROM player_games"
+                " WHERE mlb_id = ? AND stats_group = ? AND stats_year = ? AND game_date <= ?",
+                (*key, as_of or "9999-12-31"),
+            )
+            totals: dict[str, float] = {}
+            for (stats,) in games:
+                for name, value in json.loads(stats).items():
+                    totals[name] = totals.get(name, 0) + value
+            results[key] = row[0], totals
+        return results
+
+    def get_first_game_date(self) -> str | None:
+        """Return the ISO date of the earliest ingested game, if any."""
+        return self.connection.execute("SELECT MIN(game_date) FROM player_games").fetchone()[0]
+
+    def has_game_logs(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM game_logs LIMIT 1").fetchone() is not None
+
+    def mark_games_final(self, game_ids: Iterable[int]) -> dict[int, float]:
+        """Return when any process first saw each game final, recording it now if none has."""
+        game_ids = list(game_ids)
+        now = time.time()
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO final_games VALUES (?, ?)",
+                [(game_id, now) for game_id in game_ids],
+            )
+        results = {}
+        for game_id in game_ids:
+            row = self.connection.execute(
+                "SELECT final_at FROM final_games WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            results[game_id] = row[0]
+        return results
+
+    def get_value(self, name: str, max_age: float) -> tuple[Any, float] | None:
+        """Return the (value, age) of a fresh season-wide value, or None."""
+        row = self.connection.execute(
+            "SELECT value, fetched_at FROM season_values WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, fetched_at = row
+        age = time.time() - fetched_at
+        if 0 < max_age < age:
+            return None
+        return json.loads(value), age
+
+    def put_value(self, name: str, value: Any):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO season_values VALUES (?, ?, ?)",
+            (name, json.dumps(value), time.time()),
+        )
+
+    def claim_value(self, name: str, value: Any, max_age: float) -> bool:
+        """Store a value unless a fresh one is stored, and return whether it was stored.
+
+        Used by processes to agree on which of them does some work, e.g. with the
+        process id as the value.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(
+                "SELECT fetched_at FROM season_values WHERE name = ?", (name,)
+            ).fetchone()
+            if row is not None and time.time() - row[0] <= max_age:
+                return False
+            self.connection.execute(
+                "INSERT OR REPLACE INTO season_values VALUES (?, ?, ?)",
+                (name, json.dumps(value), time.time()),
+            )
+            return True
+
+    def get_value_as_of(self, name: str, as_of: str) -> Any | None:
+        """Return the latest of the values stored as ``<name>@<ISO date>`` up to a date."""
+        row = self.connection.execute(
+            "SELECT value FROM season_values WHERE name >= ? AND name <= ?"
+            " ORDER BY name DESC LIMIT 1",
+            (f"{name}@", f"{name}@{as_of}"),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_value_dates(self, name: str) -> set[str]:
+        """Return the ISO dates of the values stored as ``<name>@<ISO date>``."""
+        rows = self.connection.execute(
+            "SELECT name FROM season_values WHERE name >= ? AND name <= ?",
+            (f"{name}@", f"{name}@9999-12-31"),
+        )
+        return {row[0].partition("@")[2] for row in rows}
+
+
+_stores: dict[str, StatsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_stats_store(year: int) -> StatsStore:
+    """Return the store holding stats from the given year, under STATS_STORE_DIR/<year>/."""
+    path = os.path.join(STATS_STORE_DIR, str(year), "stats.sqlite3")
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = StatsStore(path)
+        return store
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Hashable
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker with a separate circuit per key.
+
+    After ``failure_threshold`` consecutive failures for a key, its circuit opens
+    and :meth:`allow` returns False, so callers skip the call and fall back to a
+    previous result. Once ``reset_timeout`` seconds have passed, a single trial
+    call is allowed: a success closes the circuit, and a failure opens it again
+    for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: dict[Hashable, int] = {}
+        self._opened_at: dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.reset_timeout:
+                return False
+            # Half-open: let this call through, and keep the circuit open for others.
+            self._opened_at[key] = time.monotonic()
+            return True
+
+    def is_open(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._opened_at
+
+    def record_success(self, key: Hashable):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+
+    def record_failure(self, key: Hashable):
+        with self._lock:
+            failures = self._failures[key] = self._failures.get(key, 0) + 1
+            if failures >= self.failure_threshold:
+                self._opened_at[key] = time.monotonic()
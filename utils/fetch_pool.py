@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class FetchPool:
+    """Bounded thread pool for calls to an upstream API, with timeouts and retries.
+
+    Calls are submitted as a mapping of keys to zero-argument callables::
+
+        pool = FetchPool(max_workers=4, timeout=15, retries=2)
+        results, errors = pool.run_all({key: lambda: fetch(key) for key in keys})
+
+    Every call that raises, or does not finish within ``timeout`` seconds of being
+    started (or of being submitted, while it waits for a free worker), is retried
+    up to ``retries`` times with exponential backoff starting at ``backoff``
+    seconds. Calls that still fail are reported in ``errors`` under their key.
+
+    A timed-out call cannot be interrupted, so it keeps its worker busy until it
+    returns: calls should also time out on their own, e.g. with a socket timeout.
+    Timed-out calls are not retried while every worker is still busy with one, so
+    that retries of stalled calls cannot take up the whole pool. The pool must not
+    be used from within one of its own workers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: float = 15,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_workers = max_workers
+        # Calls that timed out but are still running, and so still hold a worker.
+        self._abandoned: set[Future] = set()
+        self._abandoned_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fetch"
+        )
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        results, errors = self.run_all({None: fn})
+        if errors:
+            raise errors[None]
+        return results[None]
+
+    def run_all(
+        self, calls: dict[Hashable, Callable[[], Any]]
+    ) -> tuple[dict[Hashable, Any], dict[Hashable, Exception]]:
+        results, errors = {}, {}
+        pending = dict(calls)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            for key, (value, error) in self._run_once(pending).items():
+                if error is None:
+                    results[key] = value
+                    errors.pop(key, None)
+                    del pending[key]
+                else:
+                    errors[key] = error
+            if self.is_full():
+                # Retrying stalled calls now would only queue them behind the others.
+                for key in [key for key in pending if isinstance(errors[key], TimeoutError)]:
+                    del pending[key]
+            if not pending:
+                break
+        return results, errors
+
+    def is_full(self) -> bool:
+        """Whether every worker is busy with a call that already timed out."""
+        with self._abandoned_lock:
+            return len(self._abandoned) >= self.max_workers
+
+    def _abandon(self, future: Future):
+        with self._abandoned_lock:
+            self._abandoned.add(future)
+        future.add_done_callback(self._release)
+
+    def _release(self, future: Future):
+        with self._abandoned_lock:
+            self._abandoned.discard(future)
+
+    def _run_once(
+        self, calls: dict[Hashable, Callable[[], Any]]
+    ) -> dict[Hashable, tuple[Any, Exception | None]]:
+        started: dict[Hashable, float] = {}
+
+        def run(key: Hashable, fn: Callable[[], Any]) -> Any:
+            started[key] = time.monotonic()
+            return fn()
+
+        submitted = time.monotonic()
+        futures: dict[Future, Hashable] = {
+            self._executor.submit(run, key, fn): key for key, fn in calls.items()
+        }
+        outcomes = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = {}
+            for future in pending:
+                deadline = started.get(futures[future], submitted) + self.timeout
+                if deadline <= now:
+                    if not future.cancel():
+                        self._abandon(future)
+                    outcomes[futures[future]] = None, TimeoutError(
+                        f"Call did not finish within {self.timeout} seconds"
+                    )
+                else:
+                    deadlines[future] = deadline
+            if not deadlines:
+                break
+
+            timeout = min(deadlines.values()) - now
+            done, pending = wait(deadlines, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    outcomes[futures[future]] = future.result(), None
+                except Exception as e:
+                    outcomes[futures[future]] = None, e
+        return outcomes
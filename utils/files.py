@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+import threading
+
+
+def write_atomic(path: str, content: str | bytes):
+    """Write a file in one step, so that readers never see it half-written.
+
+    The content is written to a temporary file unique to the calling process and
+    thread, which then replaces the file, so concurrent writers of the same path
+    (e.g. web workers) never write to the same temporary file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content.encode() if isinstance(content, str) else content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
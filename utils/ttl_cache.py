@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """Thread-safe, size-bounded cache whose entries expire after a fixed TTL.
+
+    Values are looked up with :meth:`get`, which calls ``loader`` on a miss::
+
+        cache = TTLCache(ttl=600, maxsize=1024)
+        value = cache.get(key, lambda: expensive_call(key))
+
+    When the cache is full, the least recently used entry is evicted. Concurrent
+    misses for the same key are collapsed into a single call of the loader: the
+    first caller computes the value while the others block until it is ready and
+    then share the result (or the exception).
+
+    Set the TTL to zero for entries to never expire.
+    """
+
+    def __init__(self, ttl: float = 300, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_expired(entry):
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def set(self, key: Hashable, value: Any, age: float = 0.0):
+        """Store a value, which expires ``age`` seconds earlier than a fresh one."""
+        with self._lock:
+            self._store(key, value, age)
+
+    def invalidate(self, key: Hashable | None = None):
+        """Drop ``key`` from the cache, or every entry if no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _is_expired(self, entry: tuple[Any, float]) -> bool:
+        return 0 < self.ttl < time.monotonic() - entry[1]
+
+    def _store(self, key: Hashable, value: Any, age: float = 0.0):
+        self._entries[key] = (value, time.monotonic() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,188 @@
+"""Batch "what-if" simulation of league rule changes.
+
+Evaluates many variants of a season's :class:`Rules` at once, from the stats
+cached in the stats store, without any calls to the MLB Stats API. The rules
+that vary are held as arrays of shape (num_variants, 1), which broadcast against
+the per-player and per-team arrays of :mod:`ratings`, so that its functions
+compute the ratings of every variant in the same vectorized steps.
+
+A lower ``num_reserve_hitters`` or ``num_pitchers`` counts only the first
+players of each team's bench or rotation, in roster order. Rosters cannot grow,
+so a higher value counts the whole list.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, fields, replace
+import itertools
+from types import SimpleNamespace
+from typing import Sequence
+
+import numpy as np
+
+from models import Rules, Season, load_last_fetched_stats
+from ratings import (
+    HITTER_LIST_WEIGHTS,
+    HITTER_LISTS,
+    HITTING_STATS,
+    PITCHER_LIST_WEIGHTS,
+    PITCHER_LISTS,
+    PITCHING_STATS,
+    PlayerColumns,
+    adjust_hitting,
+    adjust_pitching,
+    innings_bonus_or_penalty,
+    offense,
+    pitching,
+    rate_teams,
+    team_totals,
+)
+from snapshots import get_frozen_snapshot
+from stats_store import get_stats_store
+
+RULE_NAMES: tuple[str, ...] = tuple(f.name for f in fields(Rules))
+
+
+@dataclass(frozen=True)
+class RuleVariants:
+    """Variants of a season's rules: every combination of the given values of some rules."""
+
+    base: Rules
+    # Values of each varied rule, with shape (num_variants, 1).
+    overrides: dict[str, np.ndarray]
+    num_variants: int
+
+    @classmethod
+    def grid(cls, base: Rules, choices: dict[str, Sequence[float]]) -> "RuleVariants":
+        combinations = list(itertools.product(*choices.values()))
+        overrides = {
+            name: np.array([values[i] for values in combinations], dtype=float)[:, np.newaxis]
+            for i, name in enumerate(choices)
+        }
+        return cls(base, overrides, len(combinations))
+
+    def columns(self) -> SimpleNamespace:
+        """The rules, with an array in place of each varied value, for the rating functions."""
+        return SimpleNamespace(**{
+            name: self.overrides.get(name, getattr(self.base, name)) for name in RULE_NAMES
+        })
+
+    def variant(self, index: int) -> dict[str, float]:
+        return {name: float(values[index, 0]) for name, values in self.overrides.items()}
+
+
+def counted_weights(
+    players: PlayerColumns, list_weights: np.ndarray, limited_list: int, limit: np.ndarray | int
+) -> np.ndarray:
+    """How much each player counts in each variant: 0 past the limit of the limited list."""
+    group = players.group(len(list_weights))
+    # Players are ordered by team, then list, so each (team, list) group is contiguous.
+    slot = np.arange(len(group)) - np.searchsorted(group, group)
+    weights = list_weights[players.list]
+    return np.where((players.list == limited_list) & (slot >= limit), 0.0, weights)
+
+
+@dataclass(frozen=True)
+class WhatIfResult:
+    year: int
+    managers: list[str]
+    variants: RuleVariants
+    # Ratings under the season's rules, with shape (num_teams,).
+    baseline: np.ndarray
+    # Ratings under each variant, with shape (num_variants, num_teams).
+    ratings: np.ndarray
+
+    @staticmethod
+    def rank(ratings: np.ndarray) -> np.ndarray:
+        """The 1-based standing of each team, along the last axis."""
+        return np.argsort(np.argsort(-ratings, axis=-1, kind="stable"), axis=-1) + 1
+
+    def summary(self) -> list[dict]:
+        """For each variant, the winner and how far the standings moved from the baseline."""
+        ranks = self.rank(self.ratings)
+        moved = (ranks != self.rank(self.baseline)).sum(axis=1)
+        max_change = np.abs(self.ratings - self.baseline).max(axis=1)
+        winners = self.ratings.argmax(axis=1)
+        return [
+            {
+                "rules": self.variants.variant(i),
+                "winner": self.managers[winners[i]],
+                "teams_moved": int(moved[i]),
+                "max_rating_change": float(max_change[i]),
+            }
+            for i in range(self.variants.num_variants)
+        ]
+
+    def write_csv(self, writer: csv.writer):
+        """One row per variant and team, with the team's rating and standing."""
+        ranks, baseline_ranks = self.rank(self.ratings), self.rank(self.baseline)
+        for i in range(self.variants.num_variants):
+            rules = self.variants.variant(i)
+            for t, manager in enumerate(self.managers):
+                writer.writerow([
+                    self.year,
+                    i,
+                    ";".join(f"{name}={value:g}" for name, value in rules.items()),
+                    manager,
+                    round(float(self.ratings[i, t]), 3),
+                    int(ranks[i, t]),
+                    round(float(self.baseline[t]), 3),
+                    int(baseline_ranks[t]),
+                ])
+
+
+CSV_HEADER = [
+    "year", "variant", "rules", "manager", "rating", "rank", "baseline_rating", "baseline_rank"
+]
+
+
+def load_cached_season(season: Season) -> tuple[Season, float | None, int]:
+    """Copy a season with each player's last stats from the stats store, however old.
+
+    Returns the copy, its average games played (None if it was never fetched) and
+    the number of players with no stored stats.
+    """
+    season = replace(season)
+    players = [player for team in season.teams.values() for player in team.players]
+    loaded = load_last_fetched_stats(players)
+    stored = get_stats_store(season.year).get_value("avg_games_played", max_age=0)
+    if stored is not None:
+        avg_games_played = stored[0]
+    else:
+        snapshot = get_frozen_snapshot(season)
+        avg_games_played = snapshot.avg_games_played if snapshot is not None else None
+    return season, avg_games_played, sum(player.cache_key not in loaded for player in players)
+
+
+def simulate(season: Season, variants: RuleVariants, avg_games_played: float) -> WhatIfResult:
+    """Rate every team of a season under every variant of its rules."""
+    teams = list(season.teams.values())
+    progress = avg_games_played / 162
+    rules = variants.columns()
+
+    hitters = PlayerColumns.from_teams(teams, HITTER_LISTS, HITTING_STATS, progress)
+    hitter_weights = counted_weights(
+        hitters, HITTER_LIST_WEIGHTS, HITTER_LISTS.index("bench"), rules.num_reserve_hitters
+    )
+    hitting_totals = team_totals(hitters, adjust_hitting(hitters), hitter_weights, len(teams))
+
+    pitchers = PlayerColumns.from_teams(teams, PITCHER_LISTS, PITCHING_STATS, progress)
+    pitcher_weights = counted_weights(
+        pitchers, PITCHER_LIST_WEIGHTS, PITCHER_LISTS.index("rotation"), rules.num_pitchers
+    )
+    rotation = team_totals(
+        pitchers, adjust_pitching(pitchers, rules, progress), pitcher_weights, len(teams)
+    )
+
+    ratings = (
+        offense(hitting_totals, progress)
+        + pitching(rotation, avg_games_played)
+        + innings_bonus_or_penalty(rotation, rules, progress)
+    )
+    return WhatIfResult(
+        year=season.year,
+        managers=[team.manager for team in teams],
+        variants=variants,
+        baseline=rate_teams(teams, season.rules, avg_games_played).rating,
+        ratings=np.broadcast_to(ratings, (variants.num_variants, len(teams))),
+    )